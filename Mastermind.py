@@ -2,6 +2,25 @@ import sys
 import os
 import random
 import itertools
+import glob
+import io
+import array
+import math
+import hashlib
+import json
+import csv
+import time
+import asyncio
+import functools
+import concurrent.futures
+from dataclasses import dataclass, field
+from collections import OrderedDict, deque
+
+## NumPy is optional - only used for vectorised scoring of large populations.
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 '''
 
@@ -21,12 +40,247 @@ OUT     = None
 CODE    = None
 PLAYER  = None
 
+## Set where status messages are printed - stdout (None), or stderr while the output itself is written to stdout, so the two
+## never mix.
+
+STATUS  = None
+
+## Set where a computer game's record (its code and guesses, as a human mode game file) is written - a path, or a session
+## writer (see grade_file()).
+
+COMPUTER_GAME_FILE = "computerGame.txt"
+
 ## Set default values for number of guesses allowed, length of code, and available colours.
 
 MAX_GUESSES       = 12
 CODE_LENGTH       = 4
 AVAILABLE_COLOURS = ["red", "blue", "yellow", "green", "orange"]
 
+## Set the default strategy for the computer player - see STRATEGIES.
+
+STRATEGY = "genetic"
+
+## Set whether codes may repeat colours - scored by standard Mastermind rules (see count_feedback()). Off by default.
+
+DUPLICATES = False
+
+## Set the default number of worker processes used by the minimax and entropy solvers to score candidate guesses.
+
+SOLVER_WORKERS = 1
+
+## Set the default memory budget (in bytes) for the precomputed feedback table - 0 disables it - and where it is cached.
+
+FEEDBACK_TABLE_BUDGET = 0
+CACHE_DIR             = ".mastermind_cache"
+
+## Set where graded games are cached for incremental re-grading (see GradeCache), and when cached games are evicted.
+
+GRADE_CACHE_DIR      = os.path.join(CACHE_DIR, "grades")
+GRADE_CACHE_MAX_AGE  = 30 * 24 * 60 * 60    ## Seconds since a cached game was last used.
+GRADE_CACHE_MAX_SIZE = 256 * 1024 * 1024    ## Bytes of cached output across every cached game.
+
+## Set the trace recorder - None disables instrumentation, otherwise a Trace set by the --trace option (see Trace).
+
+TRACE = None
+
+
+'''
+
+Purpose: Optional instrumentation - records where the time goes in the solvers and in grading, and writes it to a trace file.
+
+How it works:
+
+1) Instrumented code checks the global TRACE before doing any work, so when tracing is disabled (the default) the only cost is
+that one check.
+2) Counters accumulate totals - calls of fitness scoring, get_feedback, crossover, mutation and write_output, and the time spent
+writing output. Crossover and mutation never retry (both are valid by construction), so a call count is also an attempt count.
+3) Events are one row each - a generation of the genetic algorithm (wall time, population size, diversity as the fraction of
+distinct members, evaluations so far), a turn of the minimax / entropy / island solvers, a solve, and a graded file.
+4) A graded file is timed in laps - parsing the header, validating guesses (or solving, in computer mode) and writing output.
+5) Worker processes keep their own trace, which is drained after each job and merged into the parent's.
+6) write() writes a ".csv" path as one row per event and counter, and any other path as JSON - returns exit code 3 if the trace
+cannot be written.
+
+
+'''
+
+class Trace:
+    def __init__(self, path=None):
+        self.path = path
+        self.counters = {}
+        self.events = []
+        self.file = None
+        self.last_lap = None
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, event, **fields):
+        self.events.append({"event": event, **fields})
+
+    ## Starts timing a graded file - each lap() adds the time since the previous lap to the file's named timing.
+
+    def start_file(self, input_file):
+        self.file = {"input": input_file}
+        self.last_lap = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.file[name] = self.file.get(name, 0) + now - self.last_lap
+        self.last_lap = now
+
+    def end_file(self, result):
+        self.record("file", **self.file, result=result)
+        self.file = None
+
+    def drain(self):
+        counters, events = self.counters, self.events
+        self.counters, self.events = {}, []
+        return counters, events
+
+    def merge(self, trace):
+        counters, events = trace
+        for name, amount in counters.items():
+            self.count(name, amount)
+        self.events.extend(events)
+
+    def write(self, path=None):
+        path = path or self.path
+        try:
+            with open(path, "w", newline="") as f:
+                if path.endswith(".csv"):
+                    columns = ["event", "name", "value"]
+                    for event in self.events:
+                        for column in event:
+                            if column not in columns:
+                                columns.append(column)
+                    writer = csv.DictWriter(f, fieldnames=columns)
+                    writer.writeheader()
+                    writer.writerows({"event": "counter", "name": name, "value": value} for name, value in self.counters.items())
+                    writer.writerows(self.events)
+                else:
+                    json.dump({"counters": self.counters, "events": self.events}, f, indent=2)
+        except (PermissionError, IsADirectoryError, FileNotFoundError):
+            print("You do not have privileges to write to the trace file, exiting...", file=STATUS)
+            return 3
+
+
+'''
+
+Purpose: Carries the full configuration of a game and its computer player, so that many configurations can coexist in one
+process (and across threads) rather than relying on the module-level globals.
+
+How it works:
+
+1) Any setting not given explicitly is read from the module-level globals when the config is constructed - so GameConfig()
+reflects the command line arguments when running as a script.
+2) The config is frozen (and hence hashable) - colours are stored as a tuple.
+3) is_valid_code() applies the same rules as validate_code() for secret codes, without the "code" placeholder - repeated colours
+are only valid in duplicate-colour mode.
+
+
+'''
+
+@dataclass(frozen=True)
+class GameConfig:
+    code_length:           int   = field(default_factory=lambda: CODE_LENGTH)
+    available_colours:     tuple = field(default_factory=lambda: tuple(AVAILABLE_COLOURS))
+    max_guesses:           int   = field(default_factory=lambda: MAX_GUESSES)
+    tournament_size:       int   = field(default_factory=lambda: TOURNAMENT_SIZE)
+    population_size:       int   = field(default_factory=lambda: POPULATION_SIZE)
+    mutation_rate:         float = field(default_factory=lambda: MUTATION_RATE)
+    white_peg_reward:      int   = field(default_factory=lambda: WHITE_PEG_REWARD)
+    black_peg_reward:      int   = field(default_factory=lambda: BLACK_PEG_REWARD)
+    strategy:              str   = field(default_factory=lambda: STRATEGY)
+    solver_workers:        int   = field(default_factory=lambda: SOLVER_WORKERS)
+    feedback_table_budget: int   = field(default_factory=lambda: FEEDBACK_TABLE_BUDGET)
+    fitness_cache_size:    int   = field(default_factory=lambda: FITNESS_CACHE_SIZE)
+    islands:               int   = field(default_factory=lambda: ISLANDS)
+    migration_interval:    int   = field(default_factory=lambda: MIGRATION_INTERVAL)
+    migration_size:        int   = field(default_factory=lambda: MIGRATION_SIZE)
+    fitness_mode:          str   = field(default_factory=lambda: FITNESS_MODE)
+    duplicates:            bool  = field(default_factory=lambda: DUPLICATES)
+    adaptive:              bool  = field(default_factory=lambda: ADAPTIVE)
+    turn_seconds:          float = field(default_factory=lambda: TURN_SECONDS)
+    turn_evaluations:      int   = field(default_factory=lambda: TURN_EVALUATIONS)
+    stagnation_limit:      int   = field(default_factory=lambda: STAGNATION_LIMIT)
+
+    def __post_init__(self):
+        object.__setattr__(self, "available_colours", tuple(self.available_colours))
+
+    ## The CodeSpace which codes of this configuration are packed in.
+
+    @property
+    def space(self):
+        return code_space(self.available_colours, self.code_length, self.duplicates)
+
+    def is_valid_code(self, code):
+        ## Converting to set immediately removes duplicates - comparing length to original list hence determines whether there exists
+        ## any duplicates efficiently. Duplicates are only allowed in duplicate-colour mode.
+        if not self.duplicates and len(code) != len(set(code)):
+            return False
+
+        if any(colour not in self.available_colours for colour in code):
+            return False
+
+        return len(code) == self.code_length
+
+
+## Structured result for a single guess - the feedback is kept as the list of "black" / "white" pegs as in get_feedback().
+
+@dataclass(frozen=True)
+class GuessResult:
+    number:     int
+    guess:      tuple
+    valid:      bool
+    feedback:   tuple = ()
+
+    @property
+    def black_pegs(self):
+        return self.feedback.count("black")
+
+    @property
+    def white_pegs(self):
+        return self.feedback.count("white")
+
+    @property
+    def line(self):
+        if not self.valid:
+            return f"Guess {self.number}: ill-formed guess provided"
+        return f"Guess {self.number}: {' '.join(self.feedback)}"
+
+
+## Structured result for a graded game. Outcome is one of "won", "lost" or "out of guesses" - lines gives the exact output
+## file contents written in human mode.
+
+@dataclass(frozen=True)
+class GameResult:
+    outcome:                str
+    guesses:                tuple
+    max_guesses:            int
+    further_lines_ignored:  bool = False
+    exit_code:              int  = 0
+
+    @property
+    def won(self):
+        return self.outcome == "won"
+
+    @property
+    def lines(self):
+        lines = [guess.line for guess in self.guesses]
+        match self.outcome:
+            case "won":
+                lines.append(f"You won in {len(self.guesses)} guesses. Congratulations!")
+                if self.further_lines_ignored:
+                    lines.append("The game was completed. Further lines were ignored.")
+            case "out of guesses":
+                lines.append(f"You can only have {self.max_guesses} guesses")
+            case "lost":
+                lines.append("You lost. Please try again.")
+
+        return lines
+
+
 '''
 
 Purpose: Obtains feedback for a guess by comparing against the true code:
@@ -41,506 +295,3130 @@ How it works:
 Furthermore - we maintain that we haven't already checked a duplicate colour, since we only return one white feedback per
 unique colour which appears in the guess.
 
+The true code defaults to the global CODE, but can be passed explicitly (as done by Game and Solver).
+
+
+'''
+
+def get_feedback(guess, code=None):
+    if code is None:
+        code = CODE
+    if TRACE is not None:
+        TRACE.count("get_feedback")
+    feedback = []
+    checked_colours = set()
+    for i, colour in enumerate(guess):
+        if code:
+            if code[i] == colour:
+                checked_colours.add(colour)
+                feedback.append("black")
+            elif colour in code and colour not in checked_colours:
+                checked_colours.add(colour)
+                feedback.append("white")
+    
+    
+    return feedback
+
+
+'''
+
+Purpose: Obtains feedback for a guess by standard Mastermind rules - used for duplicate-colour mode, where a colour can appear
+more than once in both the guess and the code.
+
+How it works:
+
+1) Count, per colour, the positions of the code which are not matched exactly by the guess - an array indexed by colour.
+2) For every position of the guess, in order: if the colour is in the correct position, return black peg feedback.
+3) Otherwise, if the count for its colour is still above zero, return white peg feedback and use one up - so a colour never
+gets more pegs than it has occurrences in the code.
+
+Guess and code are sequences of colour indices, so the whole comparison is linear in the code length plus the number of colours.
+For codes without duplicate colours this gives the same pegs as get_feedback().
+
+
+'''
+
+def count_feedback(guess, code, num_colours):
+    remaining = [0] * num_colours
+    for guess_colour, code_colour in zip(guess, code):
+        if guess_colour != code_colour:
+            remaining[code_colour] += 1
+
+    feedback = []
+    for guess_colour, code_colour in zip(guess, code):
+        if guess_colour == code_colour:
+            feedback.append("black")
+        elif remaining[guess_colour] > 0:
+            remaining[guess_colour] -= 1
+            feedback.append("white")
+
+    return feedback
+
+
+'''
+
+Purpose: Compact code representation - a code is packed into a single integer, a few bits per peg, so that large populations
+are cheap to store, hash and compare. Colour names are only used when reading or writing codes.
+
+How it works:
+
+1) A CodeSpace holds the colour table for a configuration - each colour is its index in the available colours, stored in
+just enough bits for the number of colours. There is one CodeSpace per (colours, code length), shared by every code in it.
+2) A Code packs the colour index of position i at bits i * bits upwards. It is an int - of a subclass made for its space,
+which holds the space - so it takes no more memory than the integer, and hashes and compares as fast. Its colour indices,
+and the bitmask of the colours it contains, are unpacked from the integer when needed; for small spaces the space keeps a
+table of every value it has unpacked, shared by all its codes. Codes compare equal to codes (and integers) of the same
+value - a solve only ever compares codes of one space.
+3) A Code still behaves as a sequence of colour names (len, indexing, iteration and "in"), so it can be used wherever a list
+of colours is expected.
+4) feedback() gives exactly the pegs of get_feedback(), from the packed integers. pegs() counts them - for a guess without
+duplicate colours, the white pegs are simply the colours shared with the code (from the masks) less the black pegs. In a
+duplicate-colour space, both use standard Mastermind scoring instead (see count_feedback()).
+5) A CodeSpace also indexes its valid codes (those without duplicate colours) by rank - their position in the order of
+itertools.permutations(), and of all_codes(). In duplicate-colour mode every code is valid, and its rank is simply its colour
+indices read as digits, in the order of itertools.product(). Counting the codes which share each prefix, rank() and unrank() map between codes
+and integers directly. So the space can be iterated lazily from any rank, split into contiguous ranges of ranks for workers,
+indexed by rank like a list, and sampled uniformly by sampling ranks - without ever listing the codes, and with no draws
+rejected. Ranks are Python integers, so this holds for spaces of any size.
+
+
+'''
+
+UNPACK_TABLE_BITS = 16  ## Widest packed value (in bits) for which a CodeSpace keeps a table of unpacked codes.
+
+
+class CodeSpace:
+    def __init__(self, colours, length, duplicates=False):
+        self.colours = tuple(colours)
+        self.length = length
+        self.duplicates = duplicates
+        self.bits = max(1, (len(self.colours) - 1).bit_length())
+        self.field = (1 << self.bits) - 1
+        self.shifts = tuple(i * self.bits for i in range(length))
+        self.fields = tuple(self.field << shift for shift in self.shifts)
+        self.index = {colour: i for i, colour in enumerate(self.colours)}
+        ## blocks[i] is the number of valid codes which share the same first i + 1 colours.
+        if duplicates:
+            self.size = len(self.colours) ** length
+            self.blocks = [len(self.colours) ** (length - i - 1) for i in range(length)]
+        else:
+            self.size = math.perm(len(self.colours), length)
+            self.blocks = [math.perm(len(self.colours) - i - 1, length - i - 1) for i in range(length)] if self.size else []
+        ## unpacked[value] is the (indices, mask) of a packed value, filled in as codes are first unpacked - shared by every code
+        ## of the space, rather than kept by each. Only for spaces whose packed values fit in UNPACK_TABLE_BITS.
+        self.unpacked = [None] * (1 << self.bits * length) if self.bits * length <= UNPACK_TABLE_BITS else None
+        ## The codes of this space are instances of its own subclass of Code, which refers back to the space - so a code is
+        ## nothing but its packed integer.
+        self.code_type = type("Code", (Code,), {"__slots__": (), "space": self})
+
+    ## The colour indices of a packed value, and the bitmask of the colours among them (bit i set if colour index i is used).
+
+    def unpack(self, value):
+        table = self.unpacked
+        if table is not None and table[value] is not None:
+            return table[value]
+
+        indices = tuple((value >> shift) & self.field for shift in self.shifts)
+        mask = 0
+        for colour in indices:
+            mask |= 1 << colour
+        if table is not None:
+            table[value] = (indices, mask)
+        return indices, mask
+
+    ## Spaces with the same settings are interchangeable - code_space() only keeps the most recently used, so a space may be
+    ## built again after codes of an earlier copy were made.
+
+    def __eq__(self, other):
+        if not isinstance(other, CodeSpace):
+            return NotImplemented
+        return self is other or (self.colours, self.length, self.duplicates) == (other.colours, other.length, other.duplicates)
+
+    def __hash__(self):
+        return hash((self.colours, self.length, self.duplicates))
+
+    def from_indices(self, indices):
+        value = 0
+        for shift, colour in zip(self.shifts, indices):
+            value |= colour << shift
+        return self.code_type(value)
+
+    def from_value(self, value):
+        return self.code_type(value)
+
+    ## Packs a sequence of colour names - raises KeyError for a colour which is not available.
+
+    def code(self, colours):
+        return self.from_indices([self.index[colour] for colour in colours])
+
+    def as_code(self, code):
+        return code if isinstance(code, Code) and (code.space is self or code.space == self) else self.code(code)
+
+    ## The rank of a valid code - each colour counts the codes starting with each smaller colour not already used before it.
+
+    def rank(self, code):
+        used = 0
+        rank = 0
+        for block, colour in zip(self.blocks, self.as_code(code).indices()):
+            digit = colour
+            if not self.duplicates:
+                digit -= (used & ((1 << colour) - 1)).bit_count()
+                used |= 1 << colour
+            rank += digit * block
+        return rank
+
+    def unrank(self, rank):
+        if not 0 <= rank < self.size:
+            raise IndexError(f"Rank out of range: {rank}")
+        unused = list(range(len(self.colours)))
+        indices = []
+        for block in self.blocks:
+            digit, rank = divmod(rank, block)
+            indices.append(digit if self.duplicates else unused.pop(digit))
+        return self.from_indices(indices)
+
+    ## Lazily iterates the valid codes with ranks from start up to (not including) stop.
+
+    def codes(self, start=0, stop=None):
+        stop = self.size if stop is None else min(stop, self.size)
+        return (self.unrank(rank) for rank in range(start, stop))
+
+    ## Lazily splits the ranks into contiguous (start, stop) ranges of at most size codes.
+
+    def ranges(self, size):
+        return ((start, min(start + size, self.size)) for start in range(0, self.size, size))
+
+    ## n distinct valid codes drawn uniformly at random - random.sample() draws the ranks without listing them. It needs the
+    ## length of the range of ranks, which cannot exceed sys.maxsize - in a space that large a repeated rank is vanishingly rare,
+    ## so ranks are instead drawn one at a time until there are n distinct ones.
+
+    def sample(self, n, rng=random):
+        n = min(n, self.size)
+        if self.size <= sys.maxsize:
+            return [self.unrank(rank) for rank in rng.sample(range(self.size), n)]
+
+        ranks = {}
+        while len(ranks) < n:
+            ranks[rng.randrange(self.size)] = None
+        return [self.unrank(rank) for rank in ranks]
+
+    ## Indexing a CodeSpace by rank unranks the code - so it can stand in for the list of its codes, without listing them.
+
+    def __getitem__(self, rank):
+        return self.unrank(rank)
+
+    ## Unpickles as the shared CodeSpace of the receiving process, so codes sent between processes still compare equal.
+
+    def __reduce__(self):
+        return code_space, (self.colours, self.length, self.duplicates)
+
+
+## Most code spaces kept by code_space() - the server builds a space from each client's settings, so the cache must not grow
+## with the number of distinct settings seen.
+
+CODE_SPACE_CACHE_SIZE = 64
+
+
+@functools.lru_cache(maxsize=CODE_SPACE_CACHE_SIZE)
+def code_space(colours, length, duplicates=False):
+    return CodeSpace(colours, length, duplicates)
+
+
+## Every valid code of a configuration - all permutations of the available colours, in the order of itertools.permutations().
+## In duplicate-colour mode, every sequence of the available colours, in the order of itertools.product().
+
+def all_codes(config):
+    space = config.space
+    colours = range(len(config.available_colours))
+    if config.duplicates:
+        return [space.from_indices(indices) for indices in itertools.product(colours, repeat=config.code_length)]
+    return [space.from_indices(indices) for indices in itertools.permutations(colours, config.code_length)]
+
+
+class Code(int):
+    __slots__ = ()
+    space = None  ## Set on the subclass of each CodeSpace (see CodeSpace.__init__()).
+
+    ## The packed integer, as a plain int.
+
+    @property
+    def value(self):
+        return int(self)
+
+    def __len__(self):
+        return self.space.length
+
+    ## A code is a non-empty sequence of colours, even when its packed integer is 0.
+
+    def __bool__(self):
+        return True
+
+    ## Unpickles as a code of the receiving process's shared CodeSpace (see CodeSpace.__reduce__()).
+
+    def __reduce__(self):
+        return self.space.from_value, (int(self),)
+
+    def colour_index(self, i):
+        return (self >> (i * self.space.bits)) & self.space.field
+
+    ## The colour index of every position, as a tuple, and the bitmask of the colours used - unpacked by the space (see
+    ## CodeSpace.unpack()).
+
+    def indices(self):
+        return self.space.unpack(self)[0]
+
+    @property
+    def mask(self):
+        return self.space.unpack(self)[1]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(self.space.colours[colour] for colour in self.indices()[i])
+        if i < 0:
+            i += self.space.length
+        if not 0 <= i < self.space.length:
+            raise IndexError("code index out of range")
+        return self.space.colours[self.colour_index(i)]
+
+    def __iter__(self):
+        return (self.space.colours[colour] for colour in self.indices())
+
+    def __contains__(self, colour):
+        i = self.space.index.get(colour)
+        return i is not None and (self.mask >> i) & 1 == 1
+
+    def __repr__(self):
+        return f"Code({' '.join(self)})"
+
+    def feedback(self, code):
+        if self.space.duplicates:
+            return count_feedback(self.indices(), code.indices(), len(self.space.colours))
+
+        feedback = []
+        checked_colours = 0
+        mask = code.mask
+        for i in range(self.space.length):
+            colour = self.colour_index(i)
+            if code.colour_index(i) == colour:
+                checked_colours |= 1 << colour
+                feedback.append("black")
+            elif (mask >> colour) & 1 and not (checked_colours >> colour) & 1:
+                checked_colours |= 1 << colour
+                feedback.append("white")
+
+        return feedback
+
+    def pegs(self, code):
+        mask = None if self.space.duplicates else self.mask
+        if mask is None or mask.bit_count() != self.space.length:
+            feedback = self.feedback(code)
+            black = feedback.count("black")
+            return black, len(feedback) - black
+
+        difference = self ^ code
+        black = sum(1 for field in self.space.fields if not difference & field)
+        return black, (mask & code.mask).bit_count() - black
+
+
+'''
+
+Purpose: Integer-encoded, vectorised scoring - computes black and white peg counts for a whole batch of codes in one array
+operation, rather than one get_feedback() call per code.
+
+How it works:
+
+1) Colours are encoded as small integers by their index in the available colours, so a batch of codes is an (N, length) array.
+2) Black pegs are the count of positions where the batch and the code agree.
+3) For every colour, count its occurrences in each code (one-hot encoding summed over positions). The pegs shared between a guess
+and the code are the sum over colours of the smaller of the two counts - subtracting the black pegs leaves the white pegs.
+4) The batch can be scored against a single code, giving arrays of shape (N,), or against a history of H guesses, giving (N, H).
+
+Since secrets and every individual in the genetic algorithm contain no duplicate colours, this matches get_feedback() exactly
+for them - and in duplicate-colour mode it is exactly the standard scoring of count_feedback().
+
+NumPy is optional - without it, has_vectorised_scoring() is False and callers fall back to get_feedback().
+
+
+'''
+
+## Populations smaller than this are scored in plain Python, since array set-up costs more than it saves for a handful of codes.
+
+VECTORISE_THRESHOLD = 64
+
+
+def has_vectorised_scoring():
+    return np is not None
+
+
+def encode_codes(codes, colours):
+    if len(codes) > 0 and isinstance(codes[0], Code):
+        space = codes[0].space
+        ## Unpack every packed integer at once when they fit in 64 bits, rather than one code at a time.
+        if space.bits * space.length < 64:
+            values = np.fromiter((code.value for code in codes), dtype=np.int64, count=len(codes))
+            shifts = np.arange(space.length, dtype=np.int64) * space.bits
+            return ((values[:, None] >> shifts) & space.field).astype(np.int16)
+        return np.array([code.indices() for code in codes], dtype=np.int16).reshape(len(codes), -1)
+
+    index = {colour: i for i, colour in enumerate(colours)}
+    return np.array([[index[colour] for colour in code] for code in codes], dtype=np.int16).reshape(len(codes), -1)
+
+
+def colour_counts(encoded, num_colours):
+    return (encoded[..., None] == np.arange(num_colours, dtype=encoded.dtype)).sum(axis=-2)
+
+
+def score_batch(encoded, target, num_colours):
+    if target.ndim == 1:
+        black = (encoded == target).sum(axis=1)
+        shared = np.minimum(colour_counts(encoded, num_colours), colour_counts(target, num_colours)).sum(axis=1)
+
+    else:
+        black = (encoded[:, None, :] == target[None, :, :]).sum(axis=2)
+        shared = np.minimum(colour_counts(encoded, num_colours)[:, None, :], colour_counts(target, num_colours)[None, :, :]).sum(axis=2)
+
+    return black, shared - black
+
+
+def fitness_batch(encoded, target, num_colours, black_peg_reward, white_peg_reward):
+    black, white = score_batch(encoded, target, num_colours)
+    return black * black_peg_reward + white * white_peg_reward
+
+
+'''
+
+Purpose: Precomputed feedback table - for a given code length and set of colours, the feedback between any two valid codes never
+changes, so it is computed once for every pair, saved to a cache file and memory-mapped by every process which needs it.
+
+How it works:
+
+1) Valid codes are every permutation of the available colours of the code length, indexed in the order of
+itertools.permutations() - the same order used by the minimax and entropy solvers.
+2) Each entry encodes the feedback of a guess (row) against a code (column) as a pattern of per-position pegs - each position is
+0 (no peg), 1 (white) or 2 (black), as a base 3 number. Unlike peg counts alone, this keeps the order of pegs which
+get_feedback() returns, so the table can replace it when grading too.
+3) The table is built in chunks directly into a .npy file in CACHE_DIR, named by the code length and colours, and then
+memory-mapped read-only - so worker processes share the same pages rather than each holding a copy.
+4) The table is only used when it fits within the configured feedback_table_budget (in bytes) - a budget of 0 disables it.
+Guesses outside the table (e.g. with duplicate colours) fall back to get_feedback().
+
+
+'''
+
+LOADED_FEEDBACK_TABLES = {}  ## Feedback tables already memory-mapped by this process, keyed by (code length, colours).
+
+
+## Computes the per-position peg patterns of a batch of guesses against a batch of codes, giving a (guesses, codes) array.
+
+def feedback_patterns(guesses, codes, code_length):
+    matches = guesses[:, None, :, None] == codes[None, :, None, :]
+    black = matches.diagonal(axis1=2, axis2=3)
+    white = matches.any(axis=3) & ~black
+    return ((black * 2 + white) * 3 ** np.arange(code_length)).sum(axis=2)
+
+
+def build_feedback_table(config, path):
+    codes = encode_codes(all_codes(config), config.available_colours)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    table = np.lib.format.open_memmap(temp_path, mode="w+", dtype=FeedbackTable.dtype_for(config), shape=(len(codes), len(codes)))
+    rows = max(1, PARTITION_CHUNK_SIZE // (len(codes) * config.code_length ** 2))
+    for start in range(0, len(codes), rows):
+        table[start:start + rows] = feedback_patterns(codes[start:start + rows], codes, config.code_length)
+
+    table.flush()
+    del table
+    ## Replacing atomically means concurrent workers building the same table never read a partially written file.
+    os.replace(temp_path, path)
+
+
+class FeedbackTable:
+    def __init__(self, config, table):
+        self.code_length = config.code_length
+        self.codes = all_codes(config)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.table = table
+
+        states = (np.arange(3 ** self.code_length)[:, None] // 3 ** np.arange(self.code_length)) % 3
+        self.black = (states == 2).sum(axis=1)
+        self.white = (states == 1).sum(axis=1)
+        self.outcomes = self.black * (self.code_length + 1) + self.white
+
+    @staticmethod
+    def dtype_for(config):
+        return np.uint8 if 3 ** config.code_length <= 256 else np.uint16
+
+    @staticmethod
+    def size_for(config):
+        ## The table stores the pegs of get_feedback(), so it is not used in duplicate-colour mode.
+        if np is None or config.duplicates or 3 ** config.code_length > 65536:
+            return None
+        return math.perm(len(config.available_colours), config.code_length) ** 2 * np.dtype(FeedbackTable.dtype_for(config)).itemsize
+
+    @classmethod
+    def for_config(cls, config):
+        if config.feedback_table_budget <= 0:
+            return None
+        size = cls.size_for(config)
+        if size is None or size > config.feedback_table_budget:
+            return None
+
+        key = (config.code_length, config.available_colours)
+        if key not in LOADED_FEEDBACK_TABLES:
+            name = hashlib.sha1(" ".join(config.available_colours).encode()).hexdigest()[:16]
+            path = os.path.join(CACHE_DIR, f"feedback_{config.code_length}_{name}.npy")
+            if not os.path.exists(path):
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                build_feedback_table(config, path)
+            LOADED_FEEDBACK_TABLES[key] = cls(config, np.load(path, mmap_mode="r"))
+
+        return LOADED_FEEDBACK_TABLES[key]
+
+    ## Returns the feedback pattern of a guess against a code (both Codes), or None if either is not in the table.
+
+    def pattern(self, guess, code):
+        i = self.index.get(guess)
+        j = self.index.get(code)
+        if i is None or j is None:
+            return None
+        return int(self.table[i, j])
+
+    def get_feedback(self, guess, code):
+        pattern = self.pattern(guess, code)
+        if pattern is None:
+            return None
+
+        feedback = []
+        for _ in range(self.code_length):
+            match pattern % 3:
+                case 1:
+                    feedback.append("white")
+                case 2:
+                    feedback.append("black")
+            pattern //= 3
+
+        return feedback
+
+    def feedback_counts(self, guess, code):
+        pattern = self.pattern(guess, code)
+        if pattern is None:
+            return feedback_counts(guess, code)
+        return int(self.black[pattern]), int(self.white[pattern])
+
+
+'''
+
+Purpose: A single game against a fixed secret code, carrying its own configuration. Used in-process by graders and services,
+and by the command line through validate_guesses().
+
+How it works:
+
+1) The secret code is validated against the configuration on construction - raises ValueError if ill-formed.
+2) get_feedback() compares a guess against this game's code - looked up in the feedback table, if one fits the budget.
+Valid guesses are only packed into Codes for the table lookup - otherwise a single comparison costs less on the list of colours
+than packing the guess does, so grading compares colour lists (or, with duplicate colours, colour indices) directly.
+3) validate_guesses() grades a complete list of guesses, returning a GameResult rather than writing to the output file.
+
+
+'''
+
+class Game:
+    def __init__(self, code, config=None):
+        self.config = config if config is not None else GameConfig()
+        self.code = list(code)
+        if not self.config.is_valid_code(self.code):
+            raise ValueError(f"Ill-formed code: {' '.join(self.code)}")
+        self.space = self.config.space
+        self.secret = self.space.code(self.code)
+        self.secret_indices = self.secret.indices() if self.space.duplicates else None
+        self.table = FeedbackTable.for_config(self.config)
+
+    def get_feedback(self, guess):
+        if not isinstance(guess, Code):
+            if not self.is_valid_guess(guess):
+                return get_feedback(guess, self.code)
+            if self.table is None and not self.space.duplicates:
+                return get_feedback(guess, self.code)
+            if self.table is None:
+                if TRACE is not None:
+                    TRACE.count("get_feedback")
+                return count_feedback([self.space.index[colour] for colour in guess], self.secret_indices,
+                                      len(self.space.colours))
+            guess = self.space.code(guess)
+
+        if TRACE is not None:
+            TRACE.count("get_feedback")
+        if self.table is not None:
+            feedback = self.table.get_feedback(guess, self.secret)
+            if feedback is not None:
+                return feedback
+        return guess.feedback(self.secret)
+
+    def is_valid_guess(self, guess):
+        return len(guess) == self.config.code_length and all(map(self.space.index.__contains__, guess))
+
+    ## Grades a single guess - returns its GuessResult, and whether it is the true code.
+
+    def grade_guess(self, number, guess):
+        if isinstance(guess, str):
+            guess = guess.split()
+        guess = list(guess)
+
+        if not self.is_valid_guess(guess):
+            return GuessResult(number, tuple(guess), False), False
+
+        if self.table is not None:
+            guess_code = self.space.code(guess)
+            return GuessResult(number, tuple(guess), True, tuple(self.get_feedback(guess_code))), guess_code == self.secret
+        feedback = self.get_feedback(guess) if self.space.duplicates else get_feedback(guess, self.code)
+        return GuessResult(number, tuple(guess), True, tuple(feedback)), guess == self.code
+
+    '''
+
+    Purpose: Grades each guess, and validates whether it is a success outcome, close guess, or invalid guess.
+
+    How it works:
+
+    1) Check every guess - guesses can be any iterable, including a stream of lines which is consumed only as far as needed.
+    2) Split guess, originally consisting of colours delimited by spaces, to a list of colours which can be checked through iteration.
+    3) If the the guess is a different length to the code, or includes colours that are not available, record as invalid.
+    4) If the guess is valid, always record guess i with the correct feedback.
+    5) If we meet a guess which is the true code, the game is won. Additionally, record whether there were leftover guesses
+    which were omitted - only peeking at the next two lines, so the rest of a streamed game is never read.
+    6) If maximum guesses have been reached, immediately return as out of guesses.
+    7) If we have checked all guesses and the correct code is not found, the game is lost.
+
+
+    '''
+
+    def validate_guesses(self, guesses):
+        results = []
+        guesses = iter(guesses)
+        for i, guess in enumerate(guesses):
+            result, won = self.grade_guess(i + 1, guess)
+            results.append(result)
+
+            if won:
+                remaining = sum(1 for _ in itertools.islice(guesses, 2))
+                return GameResult("won", tuple(results), self.config.max_guesses, further_lines_ignored=remaining > 1)
+
+            if i == self.config.max_guesses - 1:
+                return GameResult("out of guesses", tuple(results), self.config.max_guesses)
+
+        return GameResult("lost", tuple(results), self.config.max_guesses)
+
+
+## Command line wrapper - grades the guesses against the global CODE and writes the result to the global OUT.
+
+def validate_guesses(guesses):
+    result = Game(CODE, GameConfig()).validate_guesses(guesses)
+    write_output(OUT, result.lines, single_line=False)
+    return result.exit_code
+
+
+'''
+
+Purpose: Validates whether a player is either ill-formed, computer or human.
+
+How it works:
+
+1) If the "player" placeholder is not included in the input file line, return error code (ill-formed player provided).
+2) If the the second word is either "human" or "computer", set this as the global PLAYER variable.
+3) Else, not a valid mode, and return error code.
+
+'''
+    
+def validate_player(player):
+    ## A blank or one-word line has no player to read.
+    if len(player) < 2 or player[0] != "player":
+        return 5         
+    
+    elif player[1] == "human" or player[1] == "computer":
+        global PLAYER
+        PLAYER = player[1].strip()
+
+    else:
+        return 5
+
+
+'''
+
+Purpose: Validates whether the code provided as a programme argument is well-formed - if so assigns as global CODE.
+
+How it works:
+
+1) If the placeholder "code" not in the input file line, return error code (ill-formed code provided).
+2) If code contains any duplicates - return error code. 
+3) If any of the colours in the code are not in available colours - return error code.
+4) If the code is the incorrect length - return error code.
+5) Else - code is valid - set as global CODE.
+
+'''
+
+
+def validate_code(code):
+    ## A blank line has no placeholder to read.
+    if len(code) == 0 or code[0] != "code":
+        return 4
+            
+    temp = code[1:]
+    
+    ## Duplicate, unavailable colour and length checks are shared with the object API - see GameConfig.is_valid_code().
+    if not GameConfig().is_valid_code(temp):
+        return 4
+    
+    global CODE
+    CODE = temp
+
+
+def generate_computer_game_file(code):
+    ## Creates new computer game file if doesn't already exists, or opens new.
+    ## Writes the code i.e. "code red blue yellow", new line, and then "player human" as is correct for a
+    ## Human mode file before guesses added in.
+    return write_output(COMPUTER_GAME_FILE, [' '.join(code), "player human"], single_line=False)
+
+
+
+'''
+
+Solution for computer player:  genetic algorithm.
+
+Motivation:
+
+Since the problem of finding Mastermind code is NP-complete - I searched for a closest optimal solution - including constraint satisfaction.
+Settled on an implementation of a genetic algorithm referenced partially from the following paper: 
+https://studenttheses.uu.nl/bitstream/handle/20.500.12932/30147/bachelorthesis_vivianvanoijen.pdf?sequence=2.
+
+Also used a GA as the representation of the codes is already suitable for the problem - since genetic algorithms
+process strings of information, such as binary codes (in our case a set of colours).
+
+Terminology:
+
+Individual - an individual code in the space of possible codes, meeting two constraints (1) no duplicate colours in a code
+(2) all colours selected from those available.
+
+Population - a set of codes.
+
+Generation - the nth population at the nth iteration of the GA.
+
+Fitness - distance of a given individual code to the true code set in programme argument.
+
+Tournament - Each round of the tournament selects n codes and returns the one with the highest fitness.
+
+Crossover - Stochastically generate new codes by splicing two parent codes.
+
+Mutation - Randomly modify a colour in a code, at the mutation rate.
+
+Elite - Selects the n codes with the highest fitness, attempting to reduce generations needed to find the correct code.
+
+Parents - The subset of codes selected for crossover.
+
+Children - The set of codes produced by crossover of parents.
+
+
+'''
+
+## Hyperparameters for the genetic algorithm.
+
+TOURNAMENT_SIZE     = 2     ## The amount of individuals per tournament.
+POPULATION_SIZE     = 10    ## Size of the population to be maintained across all generations of the algorithm.
+MUTATION_RATE       = 0.01  ## How often to mutate each individual.
+WHITE_PEG_REWARD    = 5     ## Fitness reward for receiving white peg feedback.
+BLACK_PEG_REWARD    = 10    ## Fitness reward for receiving black peg feedback.
+FITNESS_CACHE_SIZE  = 4096  ## Maximum fitness scores memoised per solve - 0 disables the cache.
+ISLANDS             = 4     ## Number of populations (each in its own process) for the island model.
+MIGRATION_INTERVAL  = 5     ## Generations each island evolves between exchanges of its best individuals.
+MIGRATION_SIZE      = 2     ## Number of best individuals which migrate to every island at each exchange.
+FITNESS_MODE        = "secret"  ## How individuals are scored - against the secret code, or by "consistency" with past guesses.
+ADAPTIVE            = False ## Size the population from the code space, and search each turn within a budget (see search_turn()).
+TURN_SECONDS        = 0.25  ## Adaptive mode - wall time budget per guess, 0 for no time limit.
+TURN_EVALUATIONS    = 0     ## Adaptive mode - fitness evaluation budget per guess, 0 for no limit.
+STAGNATION_LIMIT    = 10    ## Adaptive mode - generations without a better guess before the population is restarted.
+MAX_POPULATION_SIZE = 200   ## Adaptive mode - largest population.
+MAX_CROSSOVER_PAIRS = 500   ## Most pairs of parents crossed over per generation - the number of pairs grows quadratically.
+
+FITNESS_MODES = {"secret", "consistency"}
+
+## Consistency mode outside adaptive mode - most generations evolved per guess while looking for a code consistent with every
+## guess so far (see Solver.search_consistent()).
+
+CONSISTENCY_GENERATIONS = 50
+
+
+## Hyperparameters which can be loaded from a configuration file, by their GameConfig field names - e.g. the best configuration
+## written by sweep.py. Returns exit code 1 if the file cannot be read or contains anything else. The sizes and rewards must be
+## positive integers, the population at least one tournament (with any value not in the file taken from the current
+## configuration), and the mutation rate a probability - anything else would only fail once the genetic algorithm runs.
+
+HYPERPARAMETERS = {
+    "tournament_size":  int,
+    "population_size":  int,
+    "mutation_rate":    float,
+    "white_peg_reward": int,
+    "black_peg_reward": int,
+}
+
+def load_hyperparameters(path):
+    try:
+        with open(path, "r") as f:
+            values = json.load(f)
+    except (OSError, ValueError):
+        print("Could not read the GA configuration file, exiting...", file=STATUS)
+        return 1
+
+    if not isinstance(values, dict) or any(name not in HYPERPARAMETERS for name in values):
+        print("GA configuration file holds unknown settings, exiting...", file=STATUS)
+        return 1
+
+    loaded = {name: globals()[name.upper()] for name in HYPERPARAMETERS}
+    for name, value in values.items():
+        kind = HYPERPARAMETERS[name]
+        if isinstance(value, bool) or not isinstance(value, int if kind is int else (int, float)):
+            print(f"GA configuration setting {name} must be {'a whole number' if kind is int else 'a number'}, exiting...",
+                  file=STATUS)
+            return 1
+        loaded[name] = kind(value)
+
+    for name, kind in HYPERPARAMETERS.items():
+        if kind is int and loaded[name] < 1:
+            print(f"GA configuration setting {name} must be at least 1, exiting...", file=STATUS)
+            return 1
+    if loaded["population_size"] < loaded["tournament_size"]:
+        print("GA configuration population_size must be at least tournament_size, exiting...", file=STATUS)
+        return 1
+    if not 0 <= loaded["mutation_rate"] <= 1:
+        print("GA configuration mutation_rate must be between 0 and 1, exiting...", file=STATUS)
+        return 1
+
+    for name, value in loaded.items():
+        globals()[name.upper()] = value
+
+
+'''
+
+Purpose: Memoises fitness scores within a single solve, so elites and repeated children are not rescored every generation.
+
+How it works:
+
+1) Scores are keyed on the code (see Solver.fitness_key()) in an ordered dict, with the most recently used at the end.
+2) A hit moves the key to the end - once the cache holds more than maxsize scores, the least recently used is evicted.
+3) hits and misses count lookups, so the effectiveness of the cache can be measured. A maxsize of 0 disables the cache.
+
+
+'''
+
+class FitnessCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.scores = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        score = self.scores.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.scores.move_to_end(key)
+        return score
+
+    def put(self, key, score):
+        if self.maxsize <= 0:
+            return
+        self.scores[key] = score
+        self.scores.move_to_end(key)
+        if len(self.scores) > self.maxsize:
+            self.scores.popitem(last=False)
+
+
+## Budget used by one turn of the adaptive genetic algorithm - wall time, fitness evaluations, generations evolved and restarts
+## after stagnation (see Solver.search_turn()).
+
+@dataclass(frozen=True)
+class TurnReport:
+    seconds:        float
+    evaluations:    int
+    generations:    int
+    restarts:       int
+
+
+## Structured result of a computer player run - the guesses made (as tuples of colours), whether the code was found, and how
+## many codes were scored along the way (fitness evaluations for the genetic algorithm, feedback comparisons for the solvers).
+## In adaptive mode turns holds a TurnReport for each guess searched for.
+
+@dataclass(frozen=True)
+class SolveResult:
+    guesses:        tuple
+    solved:         bool
+    evaluations:    int = 0
+    turns:          tuple = ()
+
+
+## Population size for adaptive mode - twice the square root of the code space's size, so larger spaces are searched more widely
+## per generation. Never smaller than the configured population size, nor larger than MAX_POPULATION_SIZE or the space itself.
+
+def adaptive_population_size(config):
+    size = config.space.size
+    return max(1, min(size, max(config.population_size, min(MAX_POPULATION_SIZE, 2 * math.isqrt(size)))))
+
+
+'''
+
+Purpose: The computer player - runs the genetic algorithm against a secret code using its own configuration. The random number
+generator can be seeded per solver, so solves are reproducible and independent of each other.
+
+The methods below implement each stage of the genetic algorithm, and the module-level functions of the same names are thin
+wrappers over a Solver built from the global configuration.
+
+
+'''
+
+class Solver:
+    def __init__(self, code, config=None, seed=None):
+        self.config = config if config is not None else GameConfig()
+        self.code = list(code)
+        self.space = self.config.space
+        self.secret = self.space.code(self.code)
+        self.random = random.Random(seed) if seed is not None else random
+        self.table = FeedbackTable.for_config(self.config)
+        self.evaluations = 0
+        self.cache = FitnessCache(self.config.fitness_cache_size)
+        self.history = [] if self.config.fitness_mode == "consistency" else None
+        self.population_size = adaptive_population_size(self.config) if self.config.adaptive else self.config.population_size
+
+    ## Key for the fitness cache - the code itself, which hashes and compares as its packed integer.
+    ## Scores against the secret code never change, and in consistency mode each cached discrepancy records how much of the
+    ## guess history it covers (see discrepancies()).
+
+    def fitness_key(self, code):
+        return code
+
+    ## Returns the fitness of a code from the cache, scoring it only on a miss.
+
+    def fitness(self, code):
+        if self.history is not None:
+            return self.fitness_batch([code])[0]
+
+        code = self.space.as_code(code)
+        key = self.fitness_key(code)
+        fitness = self.cache.get(key)
+        if fitness is None:
+            fitness = self.score(code)
+            self.cache.put(key, fitness)
+
+        return fitness
+
+    '''
+
+    Purpose: Determines fitness of an individual (code) using the fitness rewards for black peg and white peg feedback.
+
+    How it works: self-explanatory. The peg counts come from the packed codes (see Code.pegs()), or from the feedback table if one
+    fits the budget.
+
+    '''
+
+    def score(self, code):
+        self.evaluations += 1
+        if TRACE is not None:
+            TRACE.count("fitness")
+        if self.table is not None:
+            black, white = self.table.feedback_counts(code, self.secret)
+        else:
+            black, white = code.pegs(self.secret)
+
+        return black * self.config.black_peg_reward + white * self.config.white_peg_reward
+
+    ## Returns the fitness of a batch of codes - cached codes are looked up, and the rest are scored together with score_codes().
+    ## Given a limit (a total of self.evaluations), scoring stops before passing it - only the fitness of the longest prefix of
+    ## the codes which fits is returned, so zip() the codes with the result.
+
+    def fitness_batch(self, codes, limit=None):
+        codes = [self.space.as_code(code) for code in codes]
+        keys = [self.fitness_key(code) for code in codes]
+        if self.history is not None:
+            entries = [self.cache.get(key) for key in keys]
+            if limit is not None:
+                ## Each code is compared against the guesses its cached entry does not cover yet.
+                remaining = limit - self.evaluations
+                for n, entry in enumerate(entries):
+                    remaining -= len(self.history) - (entry[1] if entry is not None else 0)
+                    if remaining < 0:
+                        codes, keys, entries = codes[:n], keys[:n], entries[:n]
+                        break
+            entries = self.discrepancies(codes, entries)
+            for key, entry in zip(keys, entries):
+                self.cache.put(key, entry)
+            return [-discrepancy for discrepancy, _ in entries]
+
+        scores = [self.cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if limit is not None and len(missing) > max(0, limit - self.evaluations):
+            scores = scores[:missing[max(0, limit - self.evaluations)]]
+            missing = missing[:max(0, limit - self.evaluations)]
+        if missing:
+            for i, score in zip(missing, self.score_codes([codes[i] for i in missing])):
+                scores[i] = score
+                self.cache.put(keys[i], score)
+
+        return scores
+
+    ## Scores a batch of codes at once - vectorised (see score_batch()) for large batches when NumPy is available.
+
+    def score_codes(self, codes):
+        if self.table is not None or not has_vectorised_scoring() or len(codes) < VECTORISE_THRESHOLD:
+            return [self.score(code) for code in codes]
+
+        self.evaluations += len(codes)
+        if TRACE is not None:
+            TRACE.count("fitness", len(codes))
+        colours = self.config.available_colours
+        encoded = encode_codes(codes, colours)
+        target = encode_codes([self.secret], colours)[0]
+        return fitness_batch(encoded, target, len(colours), self.config.black_peg_reward, self.config.white_peg_reward).tolist()
+
+    '''
+
+    Purpose: Consistency fitness - scores codes by how far they are from being consistent with every (guess, feedback) pair played
+    so far, so the search never looks at the secret code (as in the thesis referenced in the README).
+
+    How it works:
+
+    1) The discrepancy of a code against one past guess is the difference between the pegs the guess would have received were the
+    code the secret, and the pegs it actually received - black differences weighted by the black peg reward, white by the white.
+    A code consistent with every guess has a discrepancy of 0, and its fitness is the negated discrepancy.
+    2) Each cached entry is a (discrepancy, guesses covered) pair. A code only needs comparing against the guesses made since its
+    entry was cached - one comparison per new guess - so scoring stays flat as the game gets longer.
+    3) The comparisons against each guess are done together for every code which needs it, vectorised for large batches.
+
+    '''
+
+    def discrepancies(self, codes, entries):
+        totals = [entry[0] if entry is not None else 0 for entry in entries]
+        covered = [entry[1] if entry is not None else 0 for entry in entries]
+        for k, (guess, black, white) in enumerate(self.history):
+            pending = [i for i, n in enumerate(covered) if n <= k]
+            if not pending:
+                continue
+            for i, (code_black, code_white) in zip(pending, self.peg_counts(guess, [codes[i] for i in pending])):
+                totals[i] += (self.config.black_peg_reward * abs(code_black - black) +
+                              self.config.white_peg_reward * abs(code_white - white))
+
+        return [(total, len(self.history)) for total in totals]
+
+    ## Peg counts of a guess against each of a batch of codes - one evaluation per code.
+
+    def peg_counts(self, guess, codes):
+        self.evaluations += len(codes)
+        if TRACE is not None:
+            TRACE.count("fitness", len(codes))
+        if self.table is not None:
+            return [self.table.feedback_counts(guess, code) for code in codes]
+
+        if has_vectorised_scoring() and len(codes) >= VECTORISE_THRESHOLD:
+            colours = self.config.available_colours
+            target = encode_codes([guess], colours)[0]
+            black, white = score_batch(encode_codes(codes, colours), target, len(colours))
+            return zip(black.tolist(), white.tolist())
+
+        return [guess.pegs(code) for code in codes]
+
+    ## Plays a guess in consistency mode - its feedback joins the history which every code is scored against. Returns whether
+    ## the guess is the secret code.
+
+    def play(self, guess):
+        if self.table is not None:
+            black, white = self.table.feedback_counts(guess, self.secret)
+        else:
+            black, white = guess.pegs(self.secret)
+        self.history.append((guess, black, white))
+        return black == self.config.code_length
+
+    '''
+
+    Purpose: Initialise a population of n randomised codes which meet the following constraints (1) no duplicate colours (2) colours selected
+    only from available colours.
+
+    How it works:
+
+    1) Draw n distinct ranks uniformly from the code space, and unrank them into Codes (see CodeSpace.sample()) - every code is
+    valid and unique by construction, so no draw is ever rejected and retried. n is capped at the number of valid codes.
+    2) Score the whole population at once with fitness_batch() - given an evaluation limit, codes which cannot be scored within
+    it are left out.
+
+    Structure:
+
+    Stores codes as Codes which key into their individual evaluated fitness.
+
+
+    '''
+
+    def initialise_population(self, n, limit=None):
+        population = self.space.sample(n, self.random)
+        return dict(zip(population, self.fitness_batch(population, limit)))
+
+    '''
+    Purpose: Decides a subset of a generation of codes which should be selected for both elitism and crossover.
+
+    How it works:
+
+    1) Determines the number of rounds to carry out which should select over the entire generation.
+    2) For each round.
+    3) Sample n random codes from the generation, and add to the selected population the one with the highest fitness.
+
+
+    '''
+
+    def tournament_select(self, population):
+        selected_population = []
+        num_of_tournaments = self.population_size // self.config.tournament_size
+        members = list(population.keys())
+        for _ in range(num_of_tournaments):
+            selected_members = self.random.sample(members, k=min(self.config.tournament_size, len(population)))
+            tournament = {member: population[member] for member in selected_members}
+            selected_population.append(max(tournament, key=lambda x: tournament[x]))
+        
+        return selected_population
+
+    '''
+
+    Purpose: Implements order-based crossover between two parent codes - children never contain duplicate colours, so no child
+    is ever rejected and retried.
+
+    How it works:
+
+    1) Determines a random slice of positions in the code.
+    2) Each child keeps the slice from one parent in place.
+    3) The remaining positions are filled, in order, with the other parent's colours which are not already in the slice. Both
+    parents contain the code length of distinct colours, so the other parent always has enough of them.
+    4) In duplicate-colour mode a colour can be in the slice more than once, so the other parent's colours are taken in order
+    skipping one occurrence for each occurrence in the slice (using per-colour counts) - which leaves at least enough to fill the
+    remaining positions.
+
+    '''
+
+    def crossover(self, code1, code2):
+        if TRACE is not None:
+            TRACE.count("crossover")
+        space = self.space
+        length = space.length
+        code1 = space.as_code(code1).indices()
+        code2 = space.as_code(code2).indices()
+        ## randrange(a, b + 1) draws exactly as randint(a, b) does, without the extra call.
+        start = self.random.randrange(0, length)
+        end = self.random.randrange(start + 1, length + 1)
+        result = []
+        for first, second in ((code1, code2), (code2, code1)):
+            if space.duplicates:
+                kept = [0] * len(space.colours)
+                for colour in first[start:end]:
+                    kept[colour] += 1
+                fill = []
+                for colour in second:
+                    if kept[colour] > 0:
+                        kept[colour] -= 1
+                    else:
+                        fill.append(colour)
+                fill = fill[:length - (end - start)]
+                result.append(space.from_indices(fill[:start] + list(first[start:end]) + fill[start:]))
+                continue
+
+            kept = first[start:end]
+            fill = [colour for colour in second if colour not in kept]
+            fill = fill[:length - (end - start)]
+            result.append(space.from_indices(fill[:start] + list(kept) + fill[start:]))
+
+        return result
+
+    '''
+
+    Purpose: Randomly mutates a code - maintains diversity in the solution space.
+
+    How it works:
+
+    1. As in the main generate_guesses(), if a code has been found within the mutation rate - we then select it for mutation.
+    2. Either replaces the colour at a random position with a colour not already in the code, or swaps two positions (swap
+    mutation). Both keep the code free of duplicates by construction, so a mutation is never retried. When every colour is
+    already in the code, only swaps are possible.
+    3. In duplicate-colour mode, either replaces the colour at a random position with any other colour, or swaps two positions.
+
+
+    '''
+
+    def mutate(self, code):
+        if TRACE is not None:
+            TRACE.count("mutation")
+        packed = self.space.as_code(code)
+        code = list(packed.indices())
+        change = self.random.randrange(self.config.code_length)
+        if self.config.duplicates:
+            unused = [colour for colour in range(len(self.config.available_colours)) if colour != code[change]]
+        else:
+            mask = packed.mask
+            unused = [colour for colour in range(len(self.config.available_colours)) if not (mask >> colour) & 1]
+        if unused and (self.config.code_length == 1 or self.random.random() < 0.5):
+            code[change] = self.random.choice(unused)
+
+        elif self.config.code_length > 1:
+            swap = self.random.randrange(self.config.code_length - 1)
+            if swap >= change:
+                swap += 1
+            code[change], code[swap] = code[swap], code[change]
+
+        return self.space.from_indices(code)
+
+    '''
+
+    Purpose: Evolves a generation of codes into the next.
+
+    How it works:
+
+    1) If initial generation - initialise population of size 10.
+    2) Else - fill the new generation to at least meet 10 members if it is smaller than 10.
+    3) Select subset of generation for crossover using Tournament Selection as described above.
+    4) Select two codes from this subset as elites (elitism). These are kept without crossover.
+    5) Generate all possible pairs of differing codes as parents - itertools.combinations() never gives a pair twice in reverse
+    order. At most MAX_CROSSOVER_PAIRS of them are kept, sampled at random, since the number of pairs grows quadratically with
+    the population.
+    6) Add to the new generation the elites and the crossover of all the parents - stopping early once the deadline (a
+    time.perf_counter() value, if given) has passed, so an adaptive turn never overruns its budget by a whole generation.
+    7) Mutate new generation.
+
+    Given an evaluation limit (a total of self.evaluations), members are only scored while it allows (see fitness_batch()), and
+    crossover stops once the children could not all be scored within it. If no member can be scored, the population is returned
+    unchanged.
+
+
+    '''
+
+    def next_generation(self, population=None, deadline=None, limit=None):
+        members = []
+        ## Initialise population - later set size as function of the code length
+        if not population:
+            population = self.initialise_population(n=self.population_size, limit=limit)
+
+        else:
+            ## Fill to population of 10 to ensure continued generation.
+            members = [self.space.as_code(member) for member in population]
+            population = dict(zip(members, self.fitness_batch(members, limit)))
+
+            fill = self.population_size - len(list(population.keys()))
+            if fill > 0:
+                extra = self.initialise_population(n=fill, limit=limit) 
+                population.update(extra)
+
+        if not population:
+            return members
+             
+
+        ## Select subset as parents using Tournament Selection - returns 5 codes.
+        population = self.tournament_select(population)
+        elite = population[0:2]
+
+        
+        ## Crossover
+        parents = [(a, b) for a, b in itertools.combinations(population, 2) if a != b]
+        if len(parents) > MAX_CROSSOVER_PAIRS:
+            parents = self.random.sample(parents, MAX_CROSSOVER_PAIRS)
+        population = []
+        for pair in parents:
+            population.extend(self.crossover(pair[0], pair[1]))
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            ## A new child costs one evaluation - in consistency mode, one per guess played.
+            if limit is not None and len(population) * max(1, len(self.history or ())) >= limit - self.evaluations:
+                break
+        
+        
+        population = list(set(population))
+        ## Mutate a subset of parents:
+        for i, member in enumerate(population):
+            if self.random.random() < self.config.mutation_rate:
+                population[i] = self.mutate(member)
+
+
+        population.extend(elite)
+        return population
+
+    '''
+
+    Purpose: Generates the set of guesses used by the computer player.
+
+    How it works:
+
+    1) Until the max number of guesses allowed has been made, evolve the next generation (see evolve()).
+    2) If the correct code is in the population, add it to guesses and return it.
+    3) Else, select a random code from the population and add it to guesses, and repeat for the new generation.
+
+    The loop is iterative, and each call starts from a fresh population, list of guesses and fitness cache unless they are passed
+    in - so repeated solves in one process are independent of each other.
+
+    In consistency mode the population is never checked for the secret code - instead generations are evolved until one holds
+    a code consistent with every guess so far, and the fittest code not already guessed is played (see search_consistent() and
+    play()). The game is won when a guess receives all black pegs.
+
+    In adaptive mode each guess is instead searched for within the turn's budget (see search_turn()), and the budget used by every
+    turn is returned in the result.
+
+
+    '''
+
+    def generate_guesses(self, population=None, guesses=None):
+        guesses = [self.space.as_code(guess) for guess in guesses] if guesses else []
+        self.cache = FitnessCache(self.config.fitness_cache_size)
+        turns = []
+        if self.history is not None:
+            self.history = []
+            for guess in guesses:
+                if self.play(guess):
+                    return self.trace_result(guesses, True, turns)
+
+        while len(guesses) < self.config.max_guesses:
+            if self.config.adaptive:
+                population, guess, turn = self.search_turn(population, guesses)
+                turns.append(turn)
+            elif self.history is not None:
+                population, guess = self.search_consistent(population, guesses)
+            else:
+                population = self.evolve(population, len(guesses) + 1)
+                guess = self.choose_guess(population, guesses)
+
+            guesses.append(guess)
+            solved = self.play(guess) if self.history is not None else guess == self.secret
+            if solved:
+                return self.trace_result(guesses, True, turns)
+
+        return self.trace_result(guesses, False, turns)
+
+    ## Evolves the next generation (see next_generation()), recording it in the trace.
+
+    def evolve(self, population, generation, deadline=None, limit=None):
+        if TRACE is not None:
+            started = time.perf_counter()
+        population = self.next_generation(population, deadline, limit)
+        if TRACE is not None:
+            TRACE.record("generation", solver="genetic", generation=generation, seconds=time.perf_counter() - started,
+                         population=len(population), diversity=len(set(population)) / max(1, len(population)),
+                         evaluations=self.evaluations)
+        return population
+
+    ## Picks the guess from a generation - the secret code if it is in the population, else a random member. In consistency mode,
+    ## the fittest member not already guessed.
+
+    def choose_guess(self, population, guesses):
+        if self.history is not None:
+            fresh = [member for member in dict.fromkeys(population) if member not in guesses] or population
+            return max(zip(self.fitness_batch(fresh), fresh), key=lambda member: member[0])[1]
+
+        if self.secret in population:
+            return self.secret
+        return self.random.choice(population)
+
+    ## Consistency mode outside adaptive mode - one generation seldom holds a code consistent with every guess, so generations
+    ## are evolved until one does (a discrepancy of 0), for at most CONSISTENCY_GENERATIONS. The fittest code not already
+    ## guessed seen in any of them is played.
+
+    def search_consistent(self, population, guesses):
+        best = None
+        best_score = None
+        for _ in range(CONSISTENCY_GENERATIONS):
+            population = self.evolve(population, len(guesses) + 1)
+            fresh = [member for member in dict.fromkeys(population) if member not in guesses]
+            if fresh:
+                score, member = max(zip(self.fitness_batch(fresh), fresh), key=lambda member: member[0])
+                if best_score is None or score > best_score:
+                    best_score, best = score, member
+            if best_score == 0:
+                break
+
+        return population, best if best is not None else self.choose_guess(population, guesses)
+
+    '''
+
+    Purpose: Searches for one guess of the adaptive genetic algorithm, within the per-turn time and evaluation budgets.
+
+    How it works:
+
+    1) Evolves generations, keeping the fittest code not already guessed seen in any of them - so a collapsed or unlucky
+    generation never loses a good guess found earlier in the turn.
+    2) Stops early once the guess cannot be bettered - the secret code is in the population, or in consistency mode a code
+    consistent with every guess so far has been found.
+    3) Else stops once either budget is used up (a budget of 0 is no limit) - with neither budget set, one generation is evolved
+    per turn as outside adaptive mode. A new generation is only started if the last one would still fit in the time left, and
+    its crossover is given a deadline (see next_generation()) of half the time left - leaving the other half to score its
+    children - so a generation is cut short rather than overrun the turn. The evaluation budget is a hard cap - it is passed
+    into each generation as a limit, and no code is scored past it (see next_generation()). The turn ends once not even one more
+    code could be scored - in consistency mode a new code costs one evaluation per guess played - or once a generation scored no
+    new code, since only codes already scored are left to play.
+    4) If the best guess has not improved for STAGNATION_LIMIT generations - the population has converged on duplicates of the
+    same few codes - restarts from the two fittest members, with the rest of the population new random codes (see
+    next_generation()).
+    5) Returns the population to continue from next turn, the guess, and a TurnReport of the budget used.
+
+
+    '''
+
+    def search_turn(self, population, guesses):
+        started = time.perf_counter()
+        deadline = started + self.config.turn_seconds if self.config.turn_seconds > 0 else None
+        evaluations = self.evaluations
+        limit = evaluations + self.config.turn_evaluations if self.config.turn_evaluations > 0 else None
+        best = None
+        best_score = None
+        generations = 0
+        restarts = 0
+        stale = 0
+        while True:
+            ## Scoring the children takes about as long as producing them, so crossover gets half the time left.
+            now = time.perf_counter()
+            scored = self.evaluations
+            population = self.evolve(population, len(guesses) + 1, now + (deadline - now) / 2 if deadline is not None else None,
+                                     limit)
+            generations += 1
+            if self.history is None and self.secret in population:
+                best = self.secret
+                break
+
+            fresh = [member for member in dict.fromkeys(population) if member not in guesses]
+            scores = self.fitness_batch(fresh, limit)
+            if scores and (best_score is None or max(scores) > best_score):
+                best_score, best = max(zip(scores, fresh), key=lambda member: member[0])
+                stale = 0
+            else:
+                stale += 1
+
+            if self.history is not None and best_score == 0:
+                break
+            ## Another generation is only started if the last one would still fit in the time left.
+            finished = time.perf_counter()
+            if ((self.config.turn_seconds <= 0 and self.config.turn_evaluations <= 0) or
+                    (deadline is not None and finished + (finished - now) >= deadline) or
+                    (limit is not None and (self.evaluations == scored or
+                                            self.evaluations + max(1, len(self.history or ())) > limit))):
+                break
+
+            if stale >= self.config.stagnation_limit:
+                members = list(dict.fromkeys(population))
+                population = [member for _, member in sorted(zip(self.fitness_batch(members, limit), members),
+                                                             key=lambda member: member[0], reverse=True)[:2]]
+                restarts += 1
+                stale = 0
+
+        if best is None:
+            best = self.random.choice(population) if population else self.space.sample(1, self.random)[0]
+        turn = TurnReport(time.perf_counter() - started, self.evaluations - evaluations, generations, restarts)
+        if TRACE is not None:
+            TRACE.record("turn", solver="genetic", turn=len(guesses) + 1, seconds=turn.seconds, evaluations=turn.evaluations,
+                         generations=turn.generations, restarts=turn.restarts,
+                         time_used=turn.seconds / self.config.turn_seconds if self.config.turn_seconds > 0 else None,
+                         evaluations_used=(turn.evaluations / self.config.turn_evaluations
+                                           if self.config.turn_evaluations > 0 else None))
+        return population, best, turn
+
+    ## Builds the result of a finished solve, and records it in the trace with the fitness cache's hit rate.
+
+    def trace_result(self, guesses, solved, turns):
+        result = SolveResult(tuple(tuple(guess) for guess in guesses), solved, self.evaluations, tuple(turns))
+        if TRACE is not None:
+            TRACE.record("solve", solver="genetic", guesses=len(result.guesses), solved=result.solved,
+                         evaluations=result.evaluations, cache_hits=self.cache.hits, cache_misses=self.cache.misses)
+        return result
+
+
+## Command line wrappers over a Solver using the global configuration and CODE.
+
+def fitness(code):
+    return Solver(CODE, GameConfig()).fitness(code)
+
+
+def initialise_population(n):
+    return Solver(CODE, GameConfig()).initialise_population(n)
+
+
+def tournament_select(population):
+    return Solver(CODE, GameConfig()).tournament_select(population)
+
+
+def crossover(code1, code2):
+    return Solver(CODE, GameConfig()).crossover(code1, code2)
+
+
+def mutate(code):
+    return Solver(CODE, GameConfig()).mutate(code)
+
+
+def generate_guesses(population=None, guesses=None):
+    return list(Solver(CODE, GameConfig()).generate_guesses(population, guesses).guesses)
+
+
+'''
+
+Solution for computer player: consistency-based minimax solver (Knuth), as a deterministic alternative to the genetic algorithm.
+
+How it works:
+
+1) Enumerate every valid code - all permutations of the available colours of the code length, so no duplicate colours. Codes
+are referred to by their index into this list - their rank (see CodeSpace). Past MINIMAX_ENUMERATION_LIMIT codes the list is
+never built - codes are unranked from the CodeSpace as they are needed instead.
+2) Keep the candidate set - the ranks of every code consistent with all the feedback so far - as a compact array of integers.
+Before the first feedback every code is a candidate, so the set starts as a range of ranks, rather than an array of them all.
+3) Choose the next guess by minimax: for each possible guess, partition the candidates by the feedback it would receive, and
+pick the guess whose largest partition is smallest. Ties prefer a consistent candidate (which could win immediately), and
+then the lowest index, so the solver is deterministic.
+4) After each guess, prune the candidate set to the codes which would have given the same feedback as the true code.
+5) Repeat until the code is found or the maximum number of guesses is reached.
+
+Codes are held as packed Codes, and feedback is compared as (black, white) peg counts, as produced by get_feedback(). With
+NumPy, partitions are counted and candidates pruned in batches - see partition_counts() - optionally split across SOLVER_WORKERS
+processes. If the precomputed feedback table fits the budget, the outcomes are read from it instead (see FeedbackTable).
+
+For large code spaces, scoring every code against every candidate is too slow - past MINIMAX_EVALUATION_LIMIT comparisons, the
+guess is chosen from (a prefix of) the candidates only.
+
+
+'''
+
+MINIMAX_EVALUATION_LIMIT = 2_000_000  ## Maximum feedback comparisons when choosing a single guess.
+MINIMAX_ENUMERATION_LIMIT = 1_000_000 ## Largest code space whose codes are listed (and encoded) up front.
+
+
+## Counts the black and white pegs of get_feedback() for a guess against a code.
+
+def feedback_counts(guess, code):
+    feedback = get_feedback(guess, code)
+    black = feedback.count("black")
+    return black, len(feedback) - black
+
+
+class MinimaxSolver:
+    kind = "minimax"
+
+    def __init__(self, code, config=None, seed=None):
+        self.config = config if config is not None else GameConfig()
+        self.code = list(code)
+        self.secret = self.config.space.code(self.code)
+        self.table = FeedbackTable.for_config(self.config)
+        if self.table is not None:
+            self.codes = self.table.codes
+        elif self.config.space.size <= MINIMAX_ENUMERATION_LIMIT:
+            self.codes = all_codes(self.config)
+        else:
+            self.codes = self.config.space
+        self.encoded = (encode_codes(self.codes, self.config.available_colours)
+                        if has_vectorised_scoring() and isinstance(self.codes, list) else None)
+        self.executor = None
+        self.evaluations = 0
+
+    def feedback_counts(self, guess, code):
+        if self.table is not None:
+            return self.table.feedback_counts(guess, code)
+        return guess.pegs(code)
+
+    ## Scores a single guess by the size of its largest partition of the candidates - lower is better.
+
+    def score_partitions(self, partitions):
+        return max(partitions.values())
+
+    def score_guesses(self, pool, candidates):
+        self.evaluations += len(pool) * len(candidates)
+        if self.table is not None:
+            return score_table_pool(self.kind, self.table, np.asarray(pool), np.asarray(candidates))
+
+        if self.encoded is not None and len(pool) * len(candidates) >= VECTORISE_THRESHOLD:
+            return score_guess_pool(self.kind, self.encoded[np.asarray(pool)], self.encoded[np.asarray(candidates)],
+                                    self.config.code_length, len(self.config.available_colours), self.executor,
+                                    self.config.solver_workers)
+
+        scores = []
+        for i in pool:
+            partitions = {}
+            for j in candidates:
+                feedback = self.codes[i].pegs(self.codes[j])
+                partitions[feedback] = partitions.get(feedback, 0) + 1
+            scores.append(self.score_partitions(partitions))
+
+        return scores
+
+    def choose_guess(self, candidates):
+        if len(candidates) == 1:
+            return candidates[0]
+
+        if self.config.space.size * len(candidates) <= MINIMAX_EVALUATION_LIMIT:
+            pool = range(self.config.space.size)
+        else:
+            pool = candidates[:max(1, MINIMAX_EVALUATION_LIMIT // len(candidates))]
+
+        scores = self.score_guesses(pool, candidates)
+        consistent = candidates if isinstance(candidates, range) else set(candidates)
+        best = min(range(len(pool)), key=lambda k: (scores[k], pool[k] not in consistent, pool[k]))
+        return pool[best]
+
+    def prune(self, candidates, guess, feedback):
+        self.evaluations += len(candidates)
+        if self.table is not None:
+            candidates = np.asarray(candidates)
+            pattern = self.table.table[self.table.index[guess], candidates]
+            keep = (self.table.black[pattern] == feedback[0]) & (self.table.white[pattern] == feedback[1])
+            return array.array("L", candidates[keep].tolist())
+
+        if self.encoded is not None and len(candidates) >= VECTORISE_THRESHOLD:
+            candidates = np.asarray(candidates)
+            target = encode_codes([guess], self.config.available_colours)[0]
+            black, white = score_batch(self.encoded[candidates], target, len(self.config.available_colours))
+            return array.array("L", candidates[(black == feedback[0]) & (white == feedback[1])].tolist())
+
+        return array.array("L", (j for j in candidates if guess.pegs(self.codes[j]) == feedback))
+
+    ## The candidates before any feedback - every rank, as an array if the codes are listed, else as a range.
+
+    def all_candidates(self):
+        if isinstance(self.codes, CodeSpace):
+            return range(self.config.space.size)
+        return array.array("L", range(len(self.codes)))
+
+    def generate_guesses(self, guesses=None):
+        if self.config.solver_workers > 1 and self.encoded is not None:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.config.solver_workers) as self.executor:
+                return self.solve(guesses)
+
+        return self.solve(guesses)
+
+    ## Guesses already made (such as those from an opening book) are replayed first, pruning the candidates with their feedback.
+
+    def solve(self, guesses=None):
+        candidates = self.all_candidates()
+        guesses = [self.config.space.as_code(guess) for guess in guesses or []]
+        for guess in guesses:
+            candidates = self.prune(candidates, guess, self.feedback_counts(guess, self.secret))
+
+        while len(guesses) < self.config.max_guesses and len(candidates) > 0:
+            if TRACE is not None:
+                started = time.perf_counter()
+            guess = self.codes[self.choose_guess(candidates)]
+            if TRACE is not None:
+                TRACE.record("turn", solver=self.kind, turn=len(guesses) + 1, seconds=time.perf_counter() - started,
+                             candidates=len(candidates), evaluations=self.evaluations)
+            guesses.append(guess)
+            feedback = self.feedback_counts(guess, self.secret)
+            if feedback[0] == self.config.code_length:
+                return SolveResult(tuple(tuple(guess) for guess in guesses), True, self.evaluations)
+
+            candidates = self.prune(candidates, guess, feedback)
+
+        return SolveResult(tuple(tuple(guess) for guess in guesses), False, self.evaluations)
+
+
+
+'''
+
+Solution for computer player: maximum entropy solver. Keeps the same candidate set as the minimax solver, but picks the guess
+whose distribution of (black, white) feedback over the remaining candidates has the highest entropy - the guess which is
+expected to give the most information.
+
+Scores are negated entropies, so that the lowest score is still the best guess.
+
+
+'''
+
+class EntropySolver(MinimaxSolver):
+    kind = "entropy"
+
+    def score_partitions(self, partitions):
+        total = sum(partitions.values())
+        return sum(size / total * math.log2(size / total) for size in partitions.values())
+
+
+
+'''
+
+Purpose: Batched partition counting for the minimax and entropy solvers - for every guess in a pool, counts how many candidates
+fall into each (black, white) feedback outcome, with integer array operations rather than one get_feedback() call per pair.
+
+How it works:
+
+1) Score every guess in the pool against every candidate with score_batch(), giving (guesses, candidates) arrays of pegs.
+2) Encode each outcome as a single integer, black * (length + 1) + white.
+3) Offset the outcomes of each guess into its own range, so that one bincount over the whole array counts the partitions
+of every guess at once.
+4) The pool is processed in chunks, so the (guesses, candidates, colours) intermediate arrays stay within PARTITION_CHUNK_SIZE
+elements.
+5) With an executor, the pool is split across worker processes by guess.
+
+
+'''
+
+PARTITION_CHUNK_SIZE            = 4_000_000  ## Maximum elements in the intermediate arrays of one partition counting chunk.
+PARALLEL_PARTITION_THRESHOLD    = 1_000_000  ## Minimum comparisons before partition counting is split across processes.
+
+
+def count_outcomes(outcomes, num_outcomes):
+    offsets = np.arange(len(outcomes))[:, None] * num_outcomes
+    counts = np.bincount((outcomes + offsets).ravel(), minlength=len(outcomes) * num_outcomes)
+    return counts.reshape(len(outcomes), num_outcomes)
+
+
+def partition_counts(pool, candidates, code_length, num_colours):
+    black, white = score_batch(pool, candidates, num_colours)
+    return count_outcomes(black * (code_length + 1) + white, (code_length + 1) ** 2)
+
+
+## Scores each guess from its partition counts - the largest partition for minimax, or the negated entropy.
+
+def score_partition_counts(kind, counts, total):
+    if kind == "minimax":
+        return counts.max(axis=1)
+
+    p = counts / total
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, p * np.log2(p), 0.0).sum(axis=1)
+
+
+def score_guess_pool(kind, pool, candidates, code_length, num_colours, executor=None, workers=1):
+    if executor is not None and len(pool) * len(candidates) >= PARALLEL_PARTITION_THRESHOLD:
+        splits = np.array_split(pool, workers)
+        jobs = [executor.submit(score_guess_pool, kind, split, candidates, code_length, num_colours) for split in splits]
+        return np.concatenate([job.result() for job in jobs])
+
+    rows = max(1, PARTITION_CHUNK_SIZE // (len(candidates) * max(code_length, num_colours)))
+    scores = []
+    for start in range(0, len(pool), rows):
+        counts = partition_counts(pool[start:start + rows], candidates, code_length, num_colours)
+        scores.append(score_partition_counts(kind, counts, len(candidates)))
+
+    return np.concatenate(scores)
+
+
+## As score_guess_pool(), but reading the outcomes from a precomputed feedback table rather than scoring the codes.
+
+def score_table_pool(kind, table, pool, candidates):
+    rows = max(1, PARTITION_CHUNK_SIZE // len(candidates))
+    scores = []
+    for start in range(0, len(pool), rows):
+        outcomes = table.outcomes[table.table[np.ix_(pool[start:start + rows], candidates)]]
+        counts = count_outcomes(outcomes, (table.code_length + 1) ** 2)
+        scores.append(score_partition_counts(kind, counts, len(candidates)))
+
+    return np.concatenate(scores)
+
+
+'''
+
+Solution for computer player: island-model genetic algorithm - several independent populations (islands) evolve in separate
+processes, exchanging their best individuals, to search large code spaces with every core.
+
+How it works:
+
+1) Each island is a Solver's population, evolved with the usual tournament_select(), crossover() and mutate() operators (see
+Solver.next_generation()) for migration_interval generations at a time, in its own worker process.
+2) After each round, every island returns its population and its elites - the highest fitness codes.
+3) If any island has found the true code, it is guessed and the game is won.
+4) Otherwise the coordinator merges the elites of every island, and guesses the fittest code not already guessed.
+In consistency mode (see Solver.discrepancies()) islands never look for the true code - every guess is played and its feedback
+is sent to the islands with the next round, and the game is won when a guess receives all black pegs.
+5) The best of the merged elites migrate - they are added to every island's population for the next round.
+
+Islands are stateless between rounds - the populations are passed back and forth with each task - and each round is seeded
+from the coordinator's random number generator, so a seeded solve is reproducible.
+
+
+'''
+
+## Evolves a single island for a number of generations - a task for the island process pool.
+
+def evolve_island(job):
+    config, code, seed, population, migrants, generations, history = job
+    solver = Solver(code, config, seed=seed)
+    if solver.history is not None:
+        solver.history = list(history)
+    population = list(population or []) + list(migrants)
+    for _ in range(generations):
+        population = solver.next_generation(population)
+        if solver.history is None and solver.secret in population:
+            break
+
+    scores = solver.fitness_batch(population)
+    elites = sorted(zip(scores, population), key=lambda member: member[0], reverse=True)[:config.migration_size]
+    return population, elites, solver.history is None and solver.secret in population, solver.evaluations
+
+
+class IslandSolver:
+    def __init__(self, code, config=None, seed=None):
+        self.config = config if config is not None else GameConfig()
+        self.code = list(code)
+        self.random = random.Random(seed) if seed is not None else random
+        self.evaluations = 0
+
+    def generate_guesses(self, guesses=None):
+        if self.config.islands > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.config.islands) as executor:
+                return self.solve(executor.map, guesses)
+
+        return self.solve(map, guesses)
+
+    def solve(self, map_islands, guesses=None):
+        secret = self.config.space.code(self.code)
+        populations = [None] * self.config.islands
+        migrants = []
+        guesses = [self.config.space.as_code(guess) for guess in guesses or []]
+        history = []
+        if self.config.fitness_mode == "consistency":
+            for guess in guesses:
+                history.append((guess, *guess.pegs(secret)))
+                if guess == secret:
+                    return SolveResult(tuple(tuple(guess) for guess in guesses), True, self.evaluations)
+
+        while len(guesses) < self.config.max_guesses:
+            jobs = [(self.config, self.code, self.random.randrange(2 ** 32), population, migrants, self.config.migration_interval,
+                     history) for population in populations]
+            merged = {}
+            found = False
+            if TRACE is not None:
+                started = time.perf_counter()
+            for i, (population, elites, solved, evaluations) in enumerate(map_islands(evolve_island, jobs)):
+                populations[i] = population
+                merged.update((member, score) for score, member in elites)
+                found = found or solved
+                self.evaluations += evaluations
+            if TRACE is not None:
+                TRACE.record("turn", solver="islands", turn=len(guesses) + 1, seconds=time.perf_counter() - started,
+                             diversity=len(set().union(*populations)) / max(1, sum(map(len, populations))),
+                             evaluations=self.evaluations)
+
+            if found:
+                guesses.append(secret)
+                return SolveResult(tuple(tuple(guess) for guess in guesses), True, self.evaluations)
+
+            ranked = sorted(merged, key=lambda member: merged[member], reverse=True)
+            fresh = [member for member in ranked if member not in guesses]
+            guesses.append(fresh[0] if fresh else ranked[0])
+            migrants = ranked[:self.config.migration_size]
+            if self.config.fitness_mode == "consistency":
+                if guesses[-1] == secret:
+                    return SolveResult(tuple(tuple(guess) for guess in guesses), True, self.evaluations)
+                history.append((guesses[-1], *guesses[-1].pegs(secret)))
+
+        return SolveResult(tuple(tuple(guess) for guess in guesses), False, self.evaluations)
+
+
+## Computer player strategies selectable with the --strategy option.
+
+STRATEGIES = {
+    "genetic": Solver,
+    "minimax": MinimaxSolver,
+    "entropy": EntropySolver,
+    "islands": IslandSolver,
+}
+
+
+## Builds the computer player for the configured strategy.
+
+def make_solver(code, config=None, seed=None):
+    config = config if config is not None else GameConfig()
+    return STRATEGIES[config.strategy](code, config, seed)
+
+
+'''
+
+Purpose: Opening book - the computer player's first guesses do not depend on the secret code until feedback arrives, so they are
+computed once per (strategy, code length, colours) and stored on disk, rather than searched for at the start of every game.
+
+How it works:
+
+1) build_opening_book() plans the first two turns over the whole code space - the opening guess, and the best reply to every
+possible (black, white) feedback to it. The minimax and entropy solvers plan with their own scoring. The genetic algorithm and
+island model have no notion of a best guess before any feedback, so their books are planned by maximum entropy.
+2) Books are written as JSON to CACHE_DIR, named by strategy, code length and a hash of the colours. Building is done offline
+(see opening_book.py) - without a book on disk, the computer player simply plays its opening itself.
+3) load_opening_book() reads a book the first time it is needed, and keeps it (or the fact there is none) for the process.
+4) opening_guesses() gives the guesses the book plays against a secret code, and the solver continues from them.
+
+
+'''
+
+OPENING_BOOKS = {}  ## Opening books already read by this process (None where there is no book on disk), keyed by path.
+
+def opening_book_path(config):
+    name = hashlib.sha1(" ".join(config.available_colours).encode()).hexdigest()[:16]
+    mode = "_duplicates" if config.duplicates else ""
+    return os.path.join(CACHE_DIR, f"book_{config.strategy}_{config.code_length}{mode}_{name}.json")
+
+
+def build_opening_book(config):
+    planner = STRATEGIES[config.strategy]
+    if not issubclass(planner, MinimaxSolver):
+        planner = EntropySolver
+    solver = planner(config.space.unrank(0), config)
+    candidates = solver.all_candidates()
+    opening = solver.codes[solver.choose_guess(candidates)]
+
+    replies = {}
+    for black in range(config.code_length):
+        for white in range(config.code_length - black + 1):
+            remaining = solver.prune(candidates, opening, (black, white))
+            if len(remaining) > 0:
+                replies[f"{black} {white}"] = list(solver.codes[solver.choose_guess(remaining)])
+
+    book = {"strategy": config.strategy, "code_length": config.code_length, "colours": list(config.available_colours),
+            "duplicates": config.duplicates, "opening": list(opening), "replies": replies}
+    path = opening_book_path(config)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(book, f, indent=4)
+    os.replace(temp_path, path)
+    OPENING_BOOKS[path] = book
+    return book
+
+
+def load_opening_book(config):
+    path = opening_book_path(config)
+    if path not in OPENING_BOOKS:
+        try:
+            with open(path) as f:
+                book = json.load(f)
+        except (OSError, ValueError):
+            book = None
+        ## A book for another configuration (or an unreadable one) is treated as missing.
+        if book is not None and (book.get("code_length") != config.code_length or book.get("duplicates") != config.duplicates or
+                                 tuple(book.get("colours", ())) != config.available_colours):
+            book = None
+        OPENING_BOOKS[path] = book
+
+    return OPENING_BOOKS[path]
+
+
+## Returns the guesses an opening book plays against a secret code (as Codes) - the opening, then the reply to its feedback.
+
+def opening_guesses(book, code, config):
+    space = config.space
+    secret = space.code(code)
+    opening = space.code(book["opening"])
+    guesses = [opening]
+    black, white = opening.pegs(secret)
+    reply = book["replies"].get(f"{black} {white}")
+    if reply is not None:
+        guesses.append(space.code(reply))
+
+    return guesses[:config.max_guesses]
+
+
+## Plays the computer player against a code - from the opening book for the configuration if there is one, then the solver.
+
+def computer_guesses(code, config):
+    book = load_opening_book(config)
+    opening = opening_guesses(book, code, config) if book is not None else []
+    if opening and (opening[-1] == config.space.code(code) or len(opening) == config.max_guesses):
+        return tuple(tuple(guess) for guess in opening)
+
+    return make_solver(code, config).generate_guesses(guesses=opening).guesses
+
+
+
+'''
+
+Purpose: Wraps logic for playing the game. Including reading and validating input file.
+
+How it works:
+
+1) Reads only the two header lines, and checks the file has them - returns exit code if not.
+2) Gets the code from the first line and validates it - will either return the code or an exit code which terminates the program.
+3) Gets the player from the second line and validates it - again will either return the player or an exit code.
+4) Matches against whether PLAYER is set to human or computer mode.
+5) If in human mode - stream guesses from the input file and validate them - as described above in the validate_guesses() comment.
+Guesses are read one line at a time, so the rest of the file is never read once the game has ended.
+6) If in computer mode:
+    6a) Generate the computer game file as described above.
+    6b) Generate guesses from the selected strategy - the genetic algorithm by default - starting from the opening book for the
+    configuration if one has been built.
+    6c) Process guesses back into a single string.
+    6d) Write guesses to output file.
+
+7) If any problem with the file - including lacking permissions and invalid file path - terminate the program with appropriate exit code.
+
+
+'''
+
+## Streams the guess lines of a human-mode game file, after its header has been read. The line following the header is
+## skipped, and each guess is only read from the file when validation asks for it.
+
+def stream_guesses(f):
+    next(f, None)
+    for line in f:
+        yield line
+
+
+def read_input(input_file):
+    try:
+        with open(input_file, 'r') as f:
+            header = list(itertools.islice(f, 2))
+            if len(header) < 2:
+                print("Invalid input file, exiting...", file=STATUS)
+                return 2
+
+
+            ## First line should be "code" followed by the code colours
+            code = header[0].split()
+            result = validate_code(code)
+            if result is not None:
+                return result
+
+            
+            ## Second line is "player" followed by "human" or "computer"
+            player = header[1].split()
+            result = validate_player(player)
+            if result is not None:
+                return result
+            if TRACE is not None:
+                TRACE.lap("parse_seconds")
+            
+
+            match PLAYER:
+                case "human":
+                    guesses = stream_guesses(f)
+                    first_guess = next(guesses, None)
+                    if first_guess is None:
+                        return 2
+                    result = validate_guesses(itertools.chain([first_guess], guesses))
+                    if TRACE is not None:
+                        TRACE.lap("validate_seconds")
+                    if result is not None:
+                        return result
+
+                case "computer":
+                    result = generate_computer_game_file(code)
+                    if result is not None:
+                        return result
+                    pre_processed_guesses = computer_guesses(CODE, GameConfig())
+                    guesses = None
+                    if pre_processed_guesses is not None:
+                        guesses = [' '.join(guess) for guess in pre_processed_guesses]
+                    if TRACE is not None:
+                        TRACE.lap("solve_seconds")
+                    return write_output(COMPUTER_GAME_FILE, guesses, single_line=False) or 0
+
+
 
-'''
 
-def get_feedback(guess):
-    feedback = []
-    checked_colours = set()
-    for i, colour in enumerate(guess):
-        if CODE:
-            if CODE[i] == colour:
-                checked_colours.add(colour)
-                feedback.append("black")
-            elif colour in CODE and colour not in checked_colours:
-                checked_colours.add(colour)
-                feedback.append("white")
-    
+
+    except FileNotFoundError:
+        print("Invalid input file path provided, exiting...", file=STATUS)
+        return 2
     
-    return feedback
+    except PermissionError:
+        print("You do not have the privileges to access this file, exiting...", file=STATUS)
+        return 2
 
+    except TypeError:
+        return 2
 
 
 '''
 
-Purpose: Writes correct output for a guess, and validates whether it is a success outcome, close guess, or invalid guess.
+Purpose: Buffered output for a whole game (or batch) session - the output file is opened once and kept open, rather than
+opened in append mode for every line.
 
 How it works:
 
-1) Check every guess.
-2) Split guess, originally consisting of colours delimited by spaces, to a list of colours which can be checked through iteration.
-3) If the the guess is a different length to the code, or includes colours that are not available, return as invalid.
-4) If the guess is valid, always output guess i with the correct feedback.
-5) If we meet a guess which is the true code, present this in the output. Additionally, specify whether there were leftover guesses
-which were omitted from the output file.
-6) If maximum guesses have been reached, write this to the output and immediately return as successful completion.
-7) If we have checked all guesses and the correct code is not found, output appropriate string and return success state.
+1) The target is either an output file path, "-" for stdout, a file-like object, or None to keep the output in memory (read back
+with getvalue()) - so graders embedding the code can skip the disk completely.
+2) Lines are buffered, and written out once the buffer reaches buffer_size characters, or when flushed / closed.
+3) Output files are opened lazily on the first write (or explicitly with open()), in append mode by default.
+4) If the user does not have write permissions, the writer returns exit code 3 - and keeps returning it for any further writes.
 
 
 '''
 
-def validate_guesses(guesses):
-    for i, guess in enumerate(guesses):
-        guess = guess.split()
+OUTPUT_BUFFER_SIZE = 64 * 1024  ## Characters buffered before a session writer flushes to its output.
+
+class OutputWriter:
+    def __init__(self, target=None, mode="a", buffer_size=OUTPUT_BUFFER_SIZE):
+        self.target = target
+        self.mode = mode
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.buffered = 0
+        self.failed = False
+        self.owns_file = isinstance(target, str) and target != "-"
+
+        if target is None:
+            self.file = io.StringIO()
+        elif target == "-":
+            self.file = sys.stdout
+        elif self.owns_file:
+            self.file = None
+        else:
+            self.file = target
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def open(self):
+        if self.failed:
+            return 3
+        if self.file is None:
+            try:
+                self.file = open(self.target, self.mode)
+            except (PermissionError, IsADirectoryError, FileNotFoundError):
+                print("You do not have privileges to write to this file / create new output file, exiting...", file=STATUS)
+                self.failed = True
+                return 3
+
+    def write(self, line):
+        if self.failed:
+            return 3
+        self.buffer.append(line + '\n')
+        self.buffered += len(line) + 1
+        if self.buffered >= self.buffer_size:
+            return self.flush()
+
+    def write_lines(self, lines):
+        for line in lines:
+            result = self.write(line)
+            if result is not None:
+                return result
 
-        if len(guess) != CODE_LENGTH or any(colour not in AVAILABLE_COLOURS for colour in guess):
-            line = f"Guess {i + 1}: ill-formed guess provided"
-            write_output(OUT, line)
+    def flush(self):
+        result = self.open()
+        if result is not None:
+            return result
+        if TRACE is not None:
+            started = time.perf_counter()
+        try:
+            self.file.write(''.join(self.buffer))
+        except PermissionError:
+            print("You do not have privileges to write to this file / create new output file, exiting...", file=STATUS)
+            self.failed = True
+            return 3
+        if TRACE is not None:
+            TRACE.count("write_seconds", time.perf_counter() - started)
+        self.buffer = []
+        self.buffered = 0
+
+    def close(self):
+        result = self.flush()
+        if self.owns_file and self.file is not None:
+            self.file.close()
+            self.file = None
+        return result
 
-        else:
-            line = f"Guess {i + 1}: {' '.join(get_feedback(guess))}"
-            write_output(OUT, line)
-
-        if guess == CODE: 
-            line = f"You won in {i + 1} guesses. Congratulations!"
-            write_output(OUT, line)
-            if i < len(guesses) - 2:
-                line = "The game was completed. Further lines were ignored."
-                write_output(OUT, line)
-            
+    def getvalue(self):
+        return self.file.getvalue() + ''.join(self.buffer)
 
-            return 0
 
-        if i == MAX_GUESSES - 1:
-            line = f"You can only have {MAX_GUESSES} guesses"
-            write_output(OUT, line)
-            return 0
-        
+## Writes a single line or multiple lines to output file - specified by optional parameter.
+## The output can be an OutputWriter for the session, in which case the lines are buffered by the writer.
+## Otherwise creates the output file if it doesn't exist.
+## Returns exit code if user does not have write permissions for the current working directory.
 
-    line = "You lost. Please try again."
-    write_output(OUT, line)
-    return 0
+def write_output(output_file, lines, single_line=True):
+    if TRACE is not None:
+        TRACE.count("write_output")
+    if isinstance(output_file, OutputWriter):
+        if single_line:
+            return output_file.write(lines)
+        return output_file.write_lines(lines)
+
+    if TRACE is not None:
+        started = time.perf_counter()
+    try:
+        with open(output_file, "a") as f:
+            if single_line:
+                f.write(lines + '\n')
+            else:
+                for line in lines:
+                    f.write(line + '\n')
+    
+    except PermissionError:
+        print("You do not have privileges to write to this file / create new output file, exiting...", file=STATUS)
+        return 3
 
+    if TRACE is not None:
+        TRACE.count("write_seconds", time.perf_counter() - started)
+    
 
+    
 '''
 
-Purpose: Validates whether a player is either ill-formed, computer or human.
+Purpose: Grades a single game file with freshly reset game state, writing its result through one session writer.
 
 How it works:
 
-1) If the "player" placeholder is not included in the input file line, return error code (ill-formed player provided).
-2) If the the second word is either "human" or "computer", set this as the global PLAYER variable.
-3) Else, not a valid mode, and return error code.
+1) Resets the global IN, OUT, CODE and PLAYER so nothing carries over from a previously graded game in the same process. With
+isolated set (as in batch mode), a computer game's record is written to the game's own output rather than appended to the
+shared computerGame.txt, where records from parallel workers would interleave.
+2) Opens the session writer for this game's output - truncating it by default, or appending as the command line does. Returns
+exit code if it cannot be written.
+3) Reads and validates the game exactly as in single file mode, through read_input(), with OUT set to the session writer.
+4) Writes the error line to the output for exit codes 2, 4 and 5.
+5) Flushes and closes the writer once - returns exit code 3 if the output could not be written.
+6) When tracing, times the file in laps - parsing, validating (or solving) and writing - and records it (see Trace).
+
 
 '''
-    
-def validate_player(player):
-    if player[0] != "player":
-        return 5         
-    
-    elif player[1] == "human" or player[1] == "computer":
-        global PLAYER
-        PLAYER = player[1].strip()
 
-    else:
-        return 5
+def grade_file(input_file, output_file, mode="w", isolated=False):
+    global IN, OUT, CODE, PLAYER, COMPUTER_GAME_FILE
+    writer = output_file if isinstance(output_file, OutputWriter) else OutputWriter(output_file, mode=mode)
+    IN, OUT, CODE, PLAYER = input_file, writer, None, None
+    COMPUTER_GAME_FILE = writer if isolated else "computerGame.txt"
 
+    if writer.open() is not None:
+        return 3
 
-'''
+    if TRACE is not None:
+        TRACE.start_file(input_file)
+    result = read_input(input_file)
+    if TRACE is not None and "parse_seconds" not in TRACE.file:
+        TRACE.lap("parse_seconds")  ## Files rejected while parsing return before read_input() records the lap.
+    write_exit_message(result, writer)
+    if writer.close() is not None:
+        result = 3
+
+    if TRACE is not None:
+        TRACE.lap("write_seconds")
+        TRACE.end_file(result)
+    return result
 
-Purpose: Validates whether the code provided as a programme argument is well-formed - if so assigns as global CODE.
 
-How it works:
+## Writes the error line for exit codes which are reported in the output file rather than the terminal.
+
+EXIT_MESSAGES = {
+    2: "Issue with input file.",
+    4: "No or ill-formed code provided.",
+    5: "No or ill-formed player provided.",
+}
+
+def write_exit_message(result, output_file):
+    if result in EXIT_MESSAGES:
+        return write_output(output_file, EXIT_MESSAGES[result])
+
+
+## Applies a GameConfig to the module-level globals. Used as the process pool initialiser - worker processes do not share the
+## parent's globals under every start method, so the configuration is passed in explicitly.
+
+def apply_config(config):
+    global CODE_LENGTH, MAX_GUESSES, AVAILABLE_COLOURS, STRATEGY, FEEDBACK_TABLE_BUDGET
+    global TOURNAMENT_SIZE, POPULATION_SIZE, MUTATION_RATE, WHITE_PEG_REWARD, BLACK_PEG_REWARD, FITNESS_CACHE_SIZE
+    global ISLANDS, MIGRATION_INTERVAL, MIGRATION_SIZE, FITNESS_MODE, DUPLICATES
+    global ADAPTIVE, TURN_SECONDS, TURN_EVALUATIONS, STAGNATION_LIMIT
+    CODE_LENGTH           = config.code_length
+    MAX_GUESSES           = config.max_guesses
+    AVAILABLE_COLOURS     = list(config.available_colours)
+    STRATEGY              = config.strategy
+    FEEDBACK_TABLE_BUDGET = config.feedback_table_budget
+    TOURNAMENT_SIZE       = config.tournament_size
+    POPULATION_SIZE       = config.population_size
+    MUTATION_RATE         = config.mutation_rate
+    WHITE_PEG_REWARD      = config.white_peg_reward
+    BLACK_PEG_REWARD      = config.black_peg_reward
+    FITNESS_CACHE_SIZE    = config.fitness_cache_size
+    ISLANDS               = config.islands
+    MIGRATION_INTERVAL    = config.migration_interval
+    MIGRATION_SIZE        = config.migration_size
+    FITNESS_MODE          = config.fitness_mode
+    DUPLICATES            = config.duplicates
+    ADAPTIVE              = config.adaptive
+    TURN_SECONDS          = config.turn_seconds
+    TURN_EVALUATIONS      = config.turn_evaluations
+    STAGNATION_LIMIT      = config.stagnation_limit
+
+
+## Initialises a batch worker process - applies the configuration, and starts the worker's own trace if the parent is tracing.
+
+def start_batch_worker(config, tracing):
+    global TRACE
+    apply_config(config)
+    TRACE = Trace() if tracing else None
+
+
+## Unpacks a single (input file, output file) job for the process pool. Returns the exit code, the game's player (None if the
+## file was rejected before it) and the worker's trace of the job (or None) to be merged by the parent. An unexpected error in
+## one game file is reported as an issue with that file (exit code 2), rather than ending the whole batch.
+
+def grade_batch_job(job):
+    try:
+        result = grade_file(*job, isolated=True)
+    except Exception:
+        result = 2
+        with OutputWriter(job[1], mode="w") as writer:
+            write_exit_message(result, writer)
+    return result, PLAYER, TRACE.drain() if TRACE is not None else None
 
-1) If the placeholder "code" not in the input file line, return error code (ill-formed code provided).
-2) If code contains any duplicates - return error code. 
-3) If any of the colours in the code are not in available colours - return error code.
-4) If the code is the incorrect length - return error code.
-5) Else - code is valid - set as global CODE.
 
-'''
+## Resolves the batch argument to a sorted list of game files - either every file in a directory, or every file matching a glob.
 
+def find_game_files(pattern):
+    if os.path.isdir(pattern):
+        names = sorted(os.listdir(pattern))
+        return [os.path.join(pattern, name) for name in names if os.path.isfile(os.path.join(pattern, name))]
 
-def validate_code(code):
-    if code[0] != "code":
-        return 4
-            
-    temp = code[1:]
-    
-    ## Converting to set immediately removes duplicates - comparing length to original list hence determines whether there exists
-    ## any duplicates efficiently.
-    if len(temp) != len(set(temp)):
-        return 4
-    
-    if any(colour not in AVAILABLE_COLOURS for colour in temp):
-        return 4
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
 
-    if len(temp) != CODE_LENGTH:
-        return 4
-    
-    global CODE
-    CODE = temp
 
+'''
+
+Purpose: Incremental re-grading - a content-addressed cache of graded games, so re-grading a corpus in which few files changed
+only reads, validates and writes the games which did.
 
-def generate_computer_game_file(code):
-    ## Creates new computer game file if doesn't already exists, or opens new.
-    with open("computerGame.txt", 'a') as f:
-        ## Writes the code i.e. "code red blue yellow", new line, and then "player human" as is correct for a
-        ## Human mode file before guesses added in.
-        f.write(' '.join(code) + "\n")
-        f.write("player human" + "\n")
+How it works:
 
+1) Each game is keyed by a hash of its file's contents together with the settings its grading depends on - code length,
+maximum guesses, colours (in order) and duplicate-colour mode. Changing the file or any of the settings gives a new key.
+2) The index (index.json in GRADE_CACHE_DIR) records each key's exit code, output size and when it was last used. Each key's
+graded output is stored beside it as "<key>.txt".
+3) A hit copies the cached output to the game's output file - skipping the write if the output file already holds it - and
+gives the cached exit code without grading the game.
+4) Computer games are never cached - the computer plays afresh each time - nor are games whose output could not be written.
+5) On saving, entries unused for GRADE_CACHE_MAX_AGE seconds are evicted, then the least recently used until the cached
+outputs fit within GRADE_CACHE_MAX_SIZE bytes. The index is replaced atomically, so an interrupted run never corrupts it.
 
 
 '''
 
-Solution for computer player:  genetic algorithm.
+class GradeCache:
+    def __init__(self, config):
+        self.settings = json.dumps([config.code_length, config.max_guesses, list(config.available_colours),
+                                    config.duplicates]).encode()
+        self.index_path = os.path.join(GRADE_CACHE_DIR, "index.json")
+        try:
+            with open(self.index_path, "r") as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+        self.hits = 0
+
+    ## Hashes a game file with the settings - None if the file cannot be read, so it is graded (and its error reported) as usual.
+
+    def key(self, input_file):
+        digest = hashlib.sha256(self.settings)
+        try:
+            with open(input_file, "rb") as f:
+                for chunk in iter(lambda: f.read(64 * 1024), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def output_path(self, key):
+        return os.path.join(GRADE_CACHE_DIR, key + ".txt")
+
+    ## Copies a cached game's output to its output file, and returns its exit code - or None if the game is not cached.
+
+    def restore(self, key, output_file):
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+
+        try:
+            with open(self.output_path(key), "r") as f:
+                output = f.read()
+            try:
+                with open(output_file, "r") as f:
+                    unchanged = f.read() == output
+            except OSError:
+                unchanged = False
+            if not unchanged:
+                with open(output_file, "w") as f:
+                    f.write(output)
+        except OSError:
+            return None
+
+        entry["used"] = time.time()
+        self.hits += 1
+        return entry["result"]
+
+    ## Caches a freshly graded game's exit code and output.
+
+    def store(self, key, result, output_file):
+        try:
+            with open(output_file, "r") as f:
+                output = f.read()
+            os.makedirs(GRADE_CACHE_DIR, exist_ok=True)
+            with open(self.output_path(key), "w") as f:
+                f.write(output)
+        except OSError:
+            return
+        self.index[key] = {"result": result, "size": len(output), "used": time.time()}
+
+    def evict(self, key):
+        del self.index[key]
+        try:
+            os.remove(self.output_path(key))
+        except FileNotFoundError:
+            pass
+
+    def save(self):
+        now = time.time()
+        for key in [key for key, entry in self.index.items() if now - entry["used"] > GRADE_CACHE_MAX_AGE]:
+            self.evict(key)
+
+        size = sum(entry["size"] for entry in self.index.values())
+        for key in sorted(self.index, key=lambda key: self.index[key]["used"]):
+            if size <= GRADE_CACHE_MAX_SIZE:
+                break
+            size -= self.index[key]["size"]
+            self.evict(key)
+
+        try:
+            os.makedirs(GRADE_CACHE_DIR, exist_ok=True)
+            temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self.index, f)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            print("Could not write the grade cache index, continuing...", file=STATUS)
 
-Motivation:
 
-Since the problem of finding Mastermind code is NP-complete - I searched for a closest optimal solution - including constraint satisfaction.
-Settled on an implementation of a genetic algorithm referenced partially from the following paper: 
-https://studenttheses.uu.nl/bitstream/handle/20.500.12932/30147/bachelorthesis_vivianvanoijen.pdf?sequence=2.
+'''
 
-Also used a GA as the representation of the codes is already suitable for the problem - since genetic algorithms
-process strings of information, such as binary codes (in our case a set of colours).
+Purpose: Grades a whole directory (or glob) of game files in parallel across a process pool.
 
-Terminology:
+How it works:
 
-Individual - an individual code in the space of possible codes, meeting two constraints (1) no duplicate colours in a code
-(2) all colours selected from those available.
+1) Finds every game file, and pairs each with its own output file "<name>_output.txt" in the output directory. A computer
+game's record - its code and the computer's guesses - is written to its own output file too (see grade_file()). Files whose
+names differ only by directory or extension (say "a/game.txt" and "b/game.txt") would share an output file, so the batch
+refuses to start if any do.
+2) Starts a process pool, passing the current configuration to each worker (see apply_config()).
+3) Grades each file in isolation with grade_file(). Files are handed to workers in chunks, since process start-up and
+per-task overhead otherwise dominate with tens of thousands of small game files.
+4) Writes a summary of the exit code for every file to "batch_summary.txt" in the output directory, and prints the totals
+per exit code.
 
-Population - a set of codes.
+In incremental mode, games unchanged since they were last graded with the same settings are restored from the grade cache
+rather than graded, and the games graded are added to it (see GradeCache).
 
-Generation - the nth population at the nth iteration of the GA.
 
-Fitness - distance of a given individual code to the true code set in programme argument.
+'''
 
-Tournament - Each round of the tournament selects n codes and returns the one with the highest fitness.
+def grade_batch(pattern, output_dir, workers=None, incremental=False):
+    game_files = find_game_files(pattern)
+    if len(game_files) == 0:
+        print("No game files found for batch, exiting...", file=STATUS)
+        return 1
 
-Crossover - Stochastically generate new codes by splicing two parent codes.
+    if not os.path.isdir(output_dir):
+        print("Batch output path must be a directory, exiting...", file=STATUS)
+        return 3
 
-Mutation - Randomly modify a colour in a code, at the mutation rate.
+    output_files = [os.path.join(output_dir, os.path.splitext(os.path.basename(game_file))[0] + "_output.txt")
+                    for game_file in game_files]
+    owners = {}
+    for game_file, output_file in zip(game_files, output_files):
+        owners.setdefault(output_file, []).append(game_file)
+    clashes = [files for files in owners.values() if len(files) > 1]
+    if clashes:
+        print("Game files would share an output file, exiting...", file=STATUS)
+        for files in clashes:
+            print("    " + ", ".join(files), file=STATUS)
+        return 2
 
-Elite - Selects the n codes with the highest fitness, attempting to reduce generations needed to find the correct code.
+    config = GameConfig()
+    cache = GradeCache(config) if incremental else None
+    results = [None] * len(game_files)
+    jobs = []
+    keys = []
+    for i, (game_file, output_file) in enumerate(zip(game_files, output_files)):
+        if cache is not None:
+            key = cache.key(game_file)
+            results[i] = cache.restore(key, output_file) if key is not None else None
+            if results[i] is not None:
+                continue
+            keys.append(key)
+        jobs.append((i, (game_file, output_file)))
+
+    workers = workers or os.cpu_count() or 1
+
+    ## Build (or load) the feedback table once up front, so the workers only memory-map the cached file.
+    FeedbackTable.for_config(config)
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    if jobs:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=start_batch_worker,
+                                                    initargs=(config, TRACE is not None)) as pool:
+            graded = pool.map(grade_batch_job, [job for _, job in jobs], chunksize=chunksize)
+            for n, (result, player, trace) in enumerate(graded):
+                i, (_, output_file) = jobs[n]
+                results[i] = result
+                if trace is not None:
+                    TRACE.merge(trace)
+                if cache is not None and keys[n] is not None and player != "computer" and result != 3:
+                    cache.store(keys[n], result, output_file)
+
+    if cache is not None:
+        cache.save()
+        print(f"{cache.hits} unchanged game files restored from the grade cache.", file=STATUS)
+
+    summary = [f"{game_file}: {result}" for game_file, result in zip(game_files, results)]
+    writer = OutputWriter(os.path.join(output_dir, "batch_summary.txt"), mode="w")
+    writer.write_lines(summary)
+    result = writer.close()
+    if result is not None:
+        return result
 
-Parents - The subset of codes selected for crossover.
+    totals = {}
+    for result in results:
+        totals[result] = totals.get(result, 0) + 1
 
-Children - The set of codes produced by crossover of parents.
+    print(f"Graded {len(game_files)} game files.", file=STATUS)
+    for result in sorted(totals, key=str):
+        print(f"Exit code {result}: {totals[result]} files", file=STATUS)
+
+    return 0
 
 
 '''
 
-## Hyperparameters for the genetic algorithm.
+Purpose: Grades a stream of many games - one game per line, as JSON Lines - from a file or stdin, so a large grading job is
+one stream rather than a huge number of tiny files.
 
-TOURNAMENT_SIZE     = 2     ## The amount of individuals per tournament.
-POPULATION_SIZE     = 10    ## Size of the population to be maintained across all generations of the algorithm.
-MUTATION_RATE       = 0.01  ## How often to mutate each individual.
-WHITE_PEG_REWARD    = 5     ## Fitness reward for receiving white peg feedback.
-BLACK_PEG_REWARD    = 10    ## Fitness reward for receiving black peg feedback.
+Stream format: each line is a JSON object with "code" (a string of space separated colours, or a list of colours), "player"
+("human" or "computer"), "guesses" (a list of guess lines, or of lists of colours) for human games, and an optional "id" which
+is copied to the game's result. Blank lines are skipped. A record which is not in this format is graded as an issue with the
+input (exit code 2) - the rest of the stream is still graded.
+
+How it works:
+
+1) The input is read one line at a time, and each game is parsed, validated (with the rules of validate_code() and
+validate_player()) and graded by grade_stream_record() - a human game with Game.validate_guesses(), and a computer game by
+playing it (see computer_guesses()).
+2) Each game's result is written as one JSON line - its position in the stream, the exit code the game would have as a game
+file, and the lines which would have been written to its output file (the computer's guesses, for a computer game).
+3) With more than one worker, games are graded in a pool of worker processes (or threads), with at most STREAM_WINDOW games
+per worker in flight at once. Results are written as the oldest game in flight finishes, so they come out in the order the
+games came in, and memory stays flat however long the stream is.
+4) Prints the totals per exit code once the stream ends - returns exit code 3 if the output could not be written.
 
 
 '''
 
-Purpose: Determines fitness of an individual (code) using the fitness rewards for black peg and white peg feedback.
+STREAM_WINDOW = 16  ## Games per worker which may be in flight (read but not yet written) at once.
+
+def grade_stream_record(line):
+    config = GameConfig()
+    try:
+        record = json.loads(line)
+    except ValueError:
+        record = None
+    if not isinstance(record, dict):
+        return {"exit_code": 2, "lines": [EXIT_MESSAGES[2]]}
+
+    result = {"id": record["id"]} if "id" in record else {}
+    code = record.get("code")
+    code = code.split() if isinstance(code, str) else code
+    if not isinstance(code, list) or not all(isinstance(colour, str) for colour in code) or not config.is_valid_code(code):
+        return {**result, "exit_code": 4, "lines": [EXIT_MESSAGES[4]]}
+
+    match record.get("player"):
+        case "human":
+            guesses = record.get("guesses")
+            ## Each guess is a line, or a list of colours - anything else is a malformed record rather than a wrong guess.
+            if (not isinstance(guesses, list) or len(guesses) == 0 or
+                    not all(isinstance(guess, str) or (isinstance(guess, list) and all(isinstance(colour, str) for colour in guess))
+                            for guess in guesses)):
+                return {**result, "exit_code": 2, "lines": [EXIT_MESSAGES[2]]}
+            game = Game(code, config).validate_guesses(guesses)
+            return {**result, "exit_code": game.exit_code, "lines": game.lines}
+
+        case "computer":
+            return {**result, "exit_code": 0, "lines": [' '.join(guess) for guess in computer_guesses(code, config)]}
+
+    return {**result, "exit_code": 5, "lines": [EXIT_MESSAGES[5]]}
+
+
+def grade_stream(input_file, output_file, workers=1, threads=False):
+    try:
+        source = sys.stdin if input_file == "-" else open(input_file, 'r')
+    except FileNotFoundError:
+        print("Invalid input file path provided, exiting...", file=STATUS)
+        return 2
+    except PermissionError:
+        print("You do not have the privileges to access this file, exiting...", file=STATUS)
+        return 2
+
+    writer = OutputWriter(output_file, mode="a")
+    totals = {}
+    games = 0
 
-How it works: self-explanatory.
+    def write_result(result):
+        nonlocal games
+        totals[result["exit_code"]] = totals.get(result["exit_code"], 0) + 1
+        games += 1
+        return writer.write(json.dumps({"game": games, **result}))
 
-'''
+    try:
+        lines = (line for line in source if line.strip())
+        if workers <= 1:
+            for line in lines:
+                if write_result(grade_stream_record(line)) is not None:
+                    return 3
 
-def fitness(code):
-    fitness = 0
-    feedback = get_feedback(code)
-    for peg in feedback:
-        match peg:
-            case "white":
-                fitness += WHITE_PEG_REWARD
-            case "black":
-                fitness += BLACK_PEG_REWARD
+        else:
+            if threads:
+                pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+            else:
+                pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=apply_config, initargs=(GameConfig(),))
+            with pool:
+                in_flight = deque()
+                for line in lines:
+                    in_flight.append(pool.submit(grade_stream_record, line))
+                    if len(in_flight) >= workers * STREAM_WINDOW and write_result(in_flight.popleft().result()) is not None:
+                        return 3
+                while in_flight:
+                    if write_result(in_flight.popleft().result()) is not None:
+                        return 3
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    if writer.close() is not None:
+        return 3
+
+    print(f"Graded {games} games.", file=STATUS)
+    for result in sorted(totals, key=str):
+        print(f"Exit code {result}: {totals[result]} games", file=STATUS)
 
-    return fitness
+    return 0
 
 
 '''
 
-Purpose: Initialise a population of n randomised codes which meet the following constraints (1) no duplicate colours (2) colours selected
-only from available colours.
+Purpose: Compact binary game archive - human-mode games stored as fixed-width records of colour indices, graded straight from a
+memory-mapped file with no per-line string handling. Requires NumPy.
 
-How it works:
+Archive format:
 
-1) Continue to generate randomised codes until the population size n is met.
-2) Produce a code as a tuple, as a random sample of codes with the set code length. Only sample from available colours. 
-3) Ensure all unique codes by creating a new one if the generated already exists in the population.
+1) An 8 byte magic number, a 4 byte little-endian header length, then a JSON header holding the code length, maximum guesses
+and colour table - padded so the records start on a 64 byte boundary.
+2) One record per game: the secret code and max_guesses guesses as colour indices (one byte each), the number of guess lines
+stored, and how many further lines followed them (at most 2 - all grading ever looks at). An ill-formed guess line is stored as
+ILL_FORMED in every position, and unused guess slots as UNUSED.
 
-Structure:
+Results are a parallel column in their own file - the same header, then one record per game in the same order: the black and
+white pegs of every guess (NO_FEEDBACK for ill-formed guesses), the outcome (an index into OUTCOMES), the guesses used, and
+whether further lines were ignored.
 
-Stores codes as tuples which key into their individual evaluated fitness.
+How it works:
+
+1) convert_to_archive() reads each text game file with the same header rules as read_input() - files it would reject, and
+computer-mode games, are skipped. Records are written in chunks, so any number of games can be converted.
+2) grade_archive() memory-maps the archive and grades ARCHIVE_CHUNK records at a time, with every guess of every game in the
+chunk compared at once. The pegs follow get_feedback() exactly - including guesses with duplicate colours, by tracking a
+bitmask of colours already given a peg - so colour tables are limited to 64 colours. Archives converted in duplicate-colour
+mode record it in the header, and are graded by the standard rules of count_feedback() instead.
+3) The outcome follows Game.validate_guesses(): the first guess equal to the secret wins, otherwise the game is out of guesses
+once max_guesses guesses have been made, and lost if the guesses run out first.
 
 
 '''
-def initialise_population(n):
-    population = {}
-    while len(population) < n:
-        code = tuple(random.sample(AVAILABLE_COLOURS, k=CODE_LENGTH))
-        if code not in population:
-            population[code] = fitness(code)
 
-    return population
+ARCHIVE_MAGIC       = b"MMARCHV1"
+ARCHIVE_ALIGNMENT   = 64
+ARCHIVE_CHUNK       = 65536  ## Records converted or graded at a time.
+ILL_FORMED          = 254    ## Colour index stored for every position of an ill-formed guess.
+UNUSED              = 255    ## Colour index stored for every position of an unused guess slot.
+NO_FEEDBACK         = 255    ## Peg count stored for an ill-formed guess.
+OUTCOMES            = ("won", "lost", "out of guesses")
 
-'''
-Purpose: Decides a subset of a generation of codes which should be selected for both elitism and crossover.
 
-How it works:
+def archive_dtype(code_length, max_guesses):
+    return np.dtype([("secret", "u1", (code_length,)), ("guesses", "u1", (max_guesses, code_length)), ("count", "<u2"),
+                     ("trailing", "u1")])
 
-1) Determines the number of rounds to carry out which should select over the entire generation.
-2) For each round.
-3) Sample n random codes from the generation, and add to the selected population the one with the highest fitness.
 
+def results_dtype(max_guesses):
+    return np.dtype([("black", "u1", (max_guesses,)), ("white", "u1", (max_guesses,)), ("outcome", "u1"),
+                     ("guesses_used", "<u2"), ("further_lines_ignored", "u1")])
 
-'''
 
-def tournament_select(population):
-    selected_population = []
-    num_of_tournaments = POPULATION_SIZE // TOURNAMENT_SIZE
-    for _ in range(num_of_tournaments):
-        selected_members = random.sample(list(population.keys()), k=TOURNAMENT_SIZE)
-        tournament = {member: population[member] for member in selected_members}
-        selected_population.append(max(tournament, key=lambda x: tournament[x]))
-    
-    return selected_population
+## Writes the magic number and JSON header, padded to the record alignment - returns the offset of the first record.
 
-'''
+def write_archive_header(f, header):
+    data = json.dumps(header).encode()
+    f.write(ARCHIVE_MAGIC + len(data).to_bytes(4, "little") + data)
+    offset = -(-(len(ARCHIVE_MAGIC) + 4 + len(data)) // ARCHIVE_ALIGNMENT) * ARCHIVE_ALIGNMENT
+    f.write(bytes(offset - f.tell()))
+    return offset
 
-Purpose: Implements single-point crossover between two parent codes.
 
-How it works:
+## Reads an archive or results header - returns the header and the offset of the first record, or None if not an archive.
 
-1) Determines a crossover point in the code based on a random position from 0 up to the highest index possible.
-2) Generates two children codes from two parents, by splicing at the halfway point for both parents.
+def read_archive_header(path):
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        if f.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+            return None
+        length = int.from_bytes(f.read(4), "little")
+        header = json.loads(f.read(length))
 
-'''
+    offset = -(-(len(ARCHIVE_MAGIC) + 4 + length) // ARCHIVE_ALIGNMENT) * ARCHIVE_ALIGNMENT
+    return header, offset
 
-def crossover(code1, code2):
-    crossover_point = random.randint(0, CODE_LENGTH - 1)
-    result = [code1[:crossover_point] + code2[crossover_point:], code2[:crossover_point] + code1[crossover_point:]]
-    if len(set(result[0])) != len(result[0]) or len(result[1]) != len(set(result[1])):
-        return crossover(code1, code2)
 
-    return result
+## Memory-maps the records following the header of an archive or results file.
 
-'''
+def map_records(path, dtype, offset, mode="r"):
+    games = (os.path.getsize(path) - offset) // dtype.itemsize
+    if games == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=(games,))
 
-Purpose: Randomly mutates a code - maintains diversity in the solution space.
 
-How it works:
+## Loads an archive, or its results - returns (header, records), or None if the file is not an archive.
 
-1. As in the main generate_guesses(), if a code has been found within the mutation rate - we then select it for mutation.
-2. My mutation method simply modifies a colour in the code at a random position - checking if the new code still satisfies constraints
-and does not already exist in the population.
+def load_archive(path):
+    header = read_archive_header(path)
+    if header is None:
+        return None
+    header, offset = header
+    return header, map_records(path, archive_dtype(header["code_length"], header["max_guesses"]), offset)
 
 
-'''
+def load_archive_results(path):
+    header = read_archive_header(path)
+    if header is None:
+        return None
+    header, offset = header
+    return header, map_records(path, results_dtype(header["max_guesses"]), offset)
 
-def mutate(code, population):
-    temp = code
-    change = random.randint(0, CODE_LENGTH - 1)
-    code[change] = random.choice(AVAILABLE_COLOURS)
-    if code in population or (len(set(code)) != len(code)):
-        return mutate(temp, population)
-    
-    return code 
 
+## Reads a text game file into archive record fields - (secret, guesses, trailing lines) as colour indices, or None if the
+## file would be rejected by read_input() or is not a human-mode game.
 
-## Utility function which removes pairs which exist in the list more than once but are in reverse order.
+def read_archive_game(path, config):
+    try:
+        with open(path, 'r') as f:
+            header = list(itertools.islice(f, 2))
+            if len(header) < 2:
+                return None
+            code = header[0].split()
+            player = header[1].split()
+            if code[:1] != ["code"] or not config.is_valid_code(code[1:]) or player[:2] != ["player", "human"]:
+                return None
+
+            lines = list(itertools.islice(stream_guesses(f), config.max_guesses + 2))
+    except (FileNotFoundError, PermissionError, IsADirectoryError, UnicodeDecodeError):
+        return None
+
+    if not lines:
+        return None
+
+    index = config.space.index
+    guesses = []
+    for line in lines[:config.max_guesses]:
+        guess = line.split()
+        if len(guess) == config.code_length and all(colour in index for colour in guess):
+            guesses.append([index[colour] for colour in guess])
+        else:
+            guesses.append([ILL_FORMED] * config.code_length)
 
-def remove_ordered_duplicates(parents):
-    for (a, b) in parents:
-        if (b, a) in parents:
-            parents.remove((a, b))
-    
-    return parents
+    return [index[colour] for colour in code[1:]], guesses, len(lines) - len(guesses)
 
-'''
 
-Purpose: Generates the set of guesses used by the computer player.
+def convert_to_archive(pattern, archive_path, config=None):
+    config = config if config is not None else GameConfig()
+    if np is None or len(config.available_colours) > 64:
+        print("Game archives need NumPy and at most 64 colours, exiting...", file=STATUS)
+        return 1
 
-How it works:
+    game_files = find_game_files(pattern)
+    dtype = archive_dtype(config.code_length, config.max_guesses)
+    converted = 0
+    try:
+        with open(archive_path, "wb") as f:
+            write_archive_header(f, {"code_length": config.code_length, "max_guesses": config.max_guesses,
+                                     "colours": list(config.available_colours), "duplicates": config.duplicates})
+            for start in range(0, len(game_files), ARCHIVE_CHUNK):
+                records = np.full(ARCHIVE_CHUNK, UNUSED, dtype=dtype)
+                n = 0
+                for game_file in game_files[start:start + ARCHIVE_CHUNK]:
+                    game = read_archive_game(game_file, config)
+                    if game is None:
+                        continue
+                    secret, guesses, trailing = game
+                    records[n]["secret"] = secret
+                    records[n]["guesses"][:len(guesses)] = guesses
+                    records[n]["count"] = len(guesses)
+                    records[n]["trailing"] = trailing
+                    n += 1
+                f.write(records[:n].tobytes())
+                converted += n
+    except (PermissionError, IsADirectoryError, FileNotFoundError):
+        print("You do not have privileges to write to this file / create new output file, exiting...", file=STATUS)
+        return 3
 
-1) If we have exceeded the max number of guesses allowed - return them.
-2) If initial generation - initialise population of size 10.
-3) Else - fill the new generation to at least meet 10 members if it is smaller than 10.
-4) Select subset of generation for crossover using Tournament Selection as described above.
-5) Select three codes from this subset as elites (elitism). These are kept without crossover.
-6) Generate all possible pairs of codes as parents - excluding ordered duplicates.
-7) Add to the new generation the elites and the crossover of all the parents.
-8) Mutate new generation.
-9) If the correct code is in the population, add it to guesses and return it.
-10) Else, select a random code from the population and add it to guesses, repeat for new generation.
+    print(f"Converted {converted} of {len(game_files)} game files - {len(game_files) - converted} skipped.", file=STATUS)
+    return 0
 
 
 '''
 
+Purpose: Grades a chunk of archive records at once - returns the black and white pegs of every guess, the outcome, the guesses
+used and whether further lines were ignored, as arrays.
 
-def generate_guesses(population=[], guesses=[]):
+How it works: the pegs are built up one position at a time for every guess in the chunk. A position is black if it matches the
+secret, and white if its colour is elsewhere in the secret and has not yet been given a peg by an earlier position of the same
+guess - the checked_colours set of get_feedback(), as a bitmask per guess. In duplicate-colour mode, the pegs shared by a guess
+and the secret are the sum over colours of the smaller of their counts, as in score_batch().
 
-    if len(guesses) > MAX_GUESSES - 1:
-        return guesses
 
-    ## Initialise population - later set size as function of the code length
-    if population == []:
-        population = initialise_population(n=POPULATION_SIZE)
-
-    else:
-        ## Fill to population of 10 to ensure continued generation.
-        temp = {}
-        for member in population:
-            temp[tuple(member)] = fitness(member)
+'''
 
-        population = temp
+def grade_archive_records(records, code_length, max_guesses, num_colours, duplicates=False):
+    secret = records["secret"].astype(np.int64)
+    guesses = records["guesses"].astype(np.int64)
+    count = records["count"].astype(np.int64)
+    valid = guesses[:, :, 0] < ILL_FORMED
+    guesses = np.where(valid[:, :, None], guesses, 0)
 
-        fill = POPULATION_SIZE - len(list(population.keys()))
-        if fill > 0:
-            extra = initialise_population(n=fill) 
-            population.update(extra)
+    if duplicates:
+        black = (guesses == secret[:, None, :]).sum(axis=2)
+        shared = np.minimum(colour_counts(guesses, num_colours), colour_counts(secret, num_colours)[:, None, :]).sum(axis=2)
+        white = shared - black
 
-         
+    else:
+        bits = np.left_shift(np.uint64(1), guesses.astype(np.uint64))
+        secret_mask = np.bitwise_or.reduce(np.left_shift(np.uint64(1), secret.astype(np.uint64)), axis=1)[:, None]
+        checked = np.zeros(valid.shape, dtype=np.uint64)
+        black = np.zeros(valid.shape, dtype=np.int64)
+        white = np.zeros(valid.shape, dtype=np.int64)
+        for i in range(code_length):
+            bit = bits[:, :, i]
+            is_black = guesses[:, :, i] == secret[:, None, i]
+            is_white = ~is_black & ((secret_mask & bit) != 0) & ((checked & bit) == 0)
+            checked |= np.where(is_black | is_white, bit, np.uint64(0))
+            black += is_black
+            white += is_white
+
+    made = np.arange(max_guesses)[None, :] < count[:, None]
+    won = valid & made & (black == code_length)
+    has_won = won.any(axis=1)
+    won_at = won.argmax(axis=1)
+    guesses_used = np.where(has_won, won_at + 1, count)
+    outcome = np.where(has_won, OUTCOMES.index("won"),
+                       np.where(count >= max_guesses, OUTCOMES.index("out of guesses"), OUTCOMES.index("lost")))
+    further = has_won & (count - guesses_used + records["trailing"] >= 2)
+
+    graded = np.arange(max_guesses)[None, :] < guesses_used[:, None]
+    black = np.where(graded, np.where(valid, black, NO_FEEDBACK), 0)
+    white = np.where(graded, np.where(valid, white, NO_FEEDBACK), 0)
+    return black, white, outcome, guesses_used, further
+
+
+def grade_archive(archive_path, results_path):
+    if np is None:
+        print("Game archives need NumPy, exiting...", file=STATUS)
+        return 1
 
-    ## Select subset as parents using Tournament Selection - returns 5 codes.
-    population = tournament_select(population)
-    elite = population[0:2]
+    archive = load_archive(archive_path)
+    if archive is None:
+        print("Not a game archive, exiting...", file=STATUS)
+        return 2
+    header, records = archive
+    code_length, max_guesses = header["code_length"], header["max_guesses"]
 
-    
-    ## Crossover
-    parents = remove_ordered_duplicates([(a, b) for a, b in list(itertools.combinations(population, 2)) if a != b])
-    population = []
-    for pair in parents:
-        population.extend(crossover(pair[0], pair[1]))
-    
-    
-    population = list(set(population))
-    ## Mutate a subset of parents:
-    for i, member in enumerate(population):
-        if random.random() < MUTATION_RATE:
-            population[i] = mutate(list(member), population)
+    dtype = results_dtype(max_guesses)
+    try:
+        with open(results_path, "wb") as f:
+            offset = write_archive_header(f, header)
+            f.truncate(offset + len(records) * dtype.itemsize)
+    except (PermissionError, IsADirectoryError, FileNotFoundError):
+        print("You do not have privileges to write to this file / create new output file, exiting...", file=STATUS)
+        return 3
 
+    totals = [0] * len(OUTCOMES)
+    if len(records) > 0:
+        results = map_records(results_path, dtype, offset, mode="r+")
+        for start in range(0, len(records), ARCHIVE_CHUNK):
+            chunk = slice(start, start + ARCHIVE_CHUNK)
+            black, white, outcome, guesses_used, further = grade_archive_records(records[chunk], code_length, max_guesses,
+                                                                                 len(header["colours"]), header.get("duplicates", False))
+            results["black"][chunk] = black
+            results["white"][chunk] = white
+            results["outcome"][chunk] = outcome
+            results["guesses_used"][chunk] = guesses_used
+            results["further_lines_ignored"][chunk] = further
+            for i, total in enumerate(np.bincount(outcome, minlength=len(OUTCOMES)).tolist()):
+                totals[i] += total
+        results.flush()
+
+    print(f"Graded {len(records)} games.", file=STATUS)
+    for outcome, total in zip(OUTCOMES, totals):
+        print(f"{outcome.capitalize()}: {total} games", file=STATUS)
 
-    population.extend(elite)
+    return 0
 
-    
-    for member in population:
-        if list(member) == CODE:
-            guesses.append(CODE)
-            return guesses
-     
-    
-    ## Replace population and make call back to generate_guesses()
-    guesses.append(random.choice(population))
-    return generate_guesses(population)
 
-    
-        
 '''
 
-Purpose: Wraps logic for playing the game. Including reading and validating input file.
+Purpose: asyncio game server - many interactive players each play their own game over a simple line protocol, all served from
+one event loop rather than a thread per client.
 
-How it works:
+Protocol (one command per line, one or more reply lines):
 
-1) Checks if the file first has enough lines to be valid in either mode - returns exit code if not.
-2) Gets the code from the first line and validates it - will either return the code or an exit code which terminates the program.
-3) Gets the player from the second line and validates it - again will either return the player or an exit code.
-4) Matches against whether PLAYER is set to human or computer mode.
-5) If in human mode - get guesses from the input file and validate them - as described above in the validate_guesses() comment.
-6) If in computer mode:
-    6a) Generate the computer game file as described above.
-    6b) Generate guesses from genetic algorithm.
-    6c) Process guesses back into a single string.
-    6d) Write guesses to output file.
+new [length=N] [guesses=N] [colours=red,blue,...] [secret=red,blue,...]
+    Starts a new game for this connection - settings not given use the server's configuration, and the secret is random
+    unless given. Replies "ok" or "error <reason>" - an ill-formed secret is rejected with the same rules as validate_code().
+    A code length or number of colours above SESSION_MAX_CODE_LENGTH / SESSION_MAX_COLOURS (or the server's own, if larger)
+    is rejected as ill-formed.
+guess <colour> <colour> ...
+    Replies with the same lines as human mode - the feedback for the guess, then the outcome once the game is over.
+quit
+    Closes the connection.
 
-7) If any problem with the file - including lacking permissions and invalid file path - terminate the program with appropriate exit code.
+How it works:
+
+1) Each connection is a session holding its own Game and number of guesses - state lives only as long as the connection.
+2) A session which sends nothing for IDLE_TIMEOUT seconds is told so and closed, so idle players do not hold memory.
+3) The server listens on "host:port" over TCP, or "unix:<path>" on a Unix socket.
+4) Starting a game builds its code space, which takes time and memory growing with the settings - so the settings are
+capped, and the game is started in a worker thread rather than on the event loop, leaving other sessions responsive.
 
 
 '''
 
-def read_input(input_file):
+IDLE_TIMEOUT            = 300  ## Seconds a session may be idle before it is closed.
+SESSION_MAX_CODE_LENGTH = 12   ## Longest code a client may ask for.
+SESSION_MAX_COLOURS     = 64   ## Most colours a client may ask for.
+
+
+class GameSession:
+    def __init__(self):
+        self.game = None
+        self.guesses = 0
+        self.finished = False
+
+    def new_game(self, arguments):
+        settings = {}
+        for argument in arguments:
+            name, _, value = argument.partition("=")
+            settings[name] = value
+
+        try:
+            colours = tuple(settings["colours"].split(",")) if "colours" in settings else tuple(AVAILABLE_COLOURS)
+            config = GameConfig(code_length=int(settings.get("length", CODE_LENGTH)), available_colours=colours,
+                                max_guesses=int(settings.get("guesses", MAX_GUESSES)))
+        except ValueError:
+            return ["error ill-formed settings"]
+
+        ## Checked before the code space is built - its cost grows with both.
+        max_length = max(SESSION_MAX_CODE_LENGTH, CODE_LENGTH)
+        max_colours = max(SESSION_MAX_COLOURS, len(AVAILABLE_COLOURS))
+        if not 1 <= config.code_length <= max_length or len(colours) > max_colours:
+            return ["error ill-formed settings"]
+
+        if config.max_guesses < 1 or len(set(colours)) != len(colours) or config.space.size == 0:
+            return ["error ill-formed settings"]
+
+        secret = settings["secret"].split(",") if "secret" in settings else list(config.space.sample(1)[0])
+        try:
+            self.game = Game(secret, config)
+        except ValueError:
+            return ["error No or ill-formed code provided."]
+
+        self.guesses = 0
+        self.finished = False
+        return ["ok"]
+
+    def guess(self, guess):
+        if self.game is None or self.finished:
+            return ["error no game in progress"]
+
+        self.guesses += 1
+        result, won = self.game.grade_guess(self.guesses, guess)
+        lines = [result.line]
+        if won:
+            self.finished = True
+            lines.append(f"You won in {self.guesses} guesses. Congratulations!")
+        elif self.guesses == self.game.config.max_guesses:
+            self.finished = True
+            lines.append(f"You can only have {self.game.config.max_guesses} guesses")
+
+        return lines
+
+    def handle(self, line):
+        command, _, arguments = line.strip().partition(" ")
+        match command:
+            case "new":
+                return self.new_game(arguments.split())
+            case "guess":
+                return self.guess(arguments.split())
+            case _:
+                return ["error unknown command"]
+
+
+async def handle_connection(reader, writer):
+    loop = asyncio.get_running_loop()
+    session = GameSession()
     try:
-        with open(input_file, 'r') as f:
-            lines = f.readlines()
-            if len(lines) < 2:
-                print("Invalid input file, exiting...")
-                return 2
+        while True:
+            try:
+                line = await asyncio.wait_for(reader.readline(), timeout=IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                writer.write(b"error session timed out\n")
+                break
+
+            if not line or line.strip() == b"quit":
+                break
+
+            line = line.decode(errors="replace")
+            if line.lstrip().startswith("new"):
+                replies = await loop.run_in_executor(None, session.handle, line)
+            else:
+                replies = session.handle(line)
+            writer.write(''.join(reply + "\n" for reply in replies).encode())
+            await writer.drain()
 
+    except (ConnectionError, ValueError):
+        pass
 
-            ## First line should be "code" followed by the code colours
-            code = lines[0].split()
-            result = validate_code(code)
-            if result is not None:
-                return result
+    finally:
+        writer.close()
 
-            
-            ## Second line is "player" followed by "human" or "computer"
-            player = lines[1].split()
-            result = validate_player(player)
-            if result is not None:
-                return result
-            
 
-            match PLAYER:
-                case "human":
-                    guesses = lines[3:]
-                    if len(guesses) == 0:
-                        return 2
-                    result = validate_guesses(guesses)
-                    if result is not None:
-                        return result
+async def run_server(address):
+    if address.startswith("unix:"):
+        server = await asyncio.start_unix_server(handle_connection, path=address[len("unix:"):])
+    else:
+        host, _, port = address.rpartition(":")
+        server = await asyncio.start_server(handle_connection, host=host or None, port=int(port))
 
-                case "computer":
-                    generate_computer_game_file(code)
-                    pre_processed_guesses = generate_guesses()
-                    guesses = None
-                    if pre_processed_guesses is not None:
-                        guesses = [' '.join(guess) for guess in pre_processed_guesses]
-                    write_output("computerGame.txt", guesses, single_line=False)
-                    return 0
+    async with server:
+        await server.serve_forever()
 
 
+## Runs the game server until interrupted - returns exit code 1 if the address is ill-formed or cannot be listened on.
 
+def serve(address):
+    try:
+        asyncio.run(run_server(address))
+    except (ValueError, OSError):
+        print("Could not start the game server, exiting...", file=STATUS)
+        return 1
+    except KeyboardInterrupt:
+        pass
 
+    return 0
 
-    except FileNotFoundError:
-        print("Invalid input file path provided, exiting...")
-        return 2
-    
-    except PermissionError:
-        print("You do not have the privileges to access this file, exiting...")
-        return 2
 
-    except TypeError:
-        return 2
+## Separates "--option" / "--option=value" arguments from the positional programme arguments.
 
+KNOWN_OPTIONS = {"batch", "stream", "workers", "strategy", "feedback-table", "ga-config", "islands", "serve", "trace", "fitness",
+                 "duplicates", "adaptive", "turn-seconds", "turn-evaluations", "incremental"}
 
-## Writes a single line or multiple lines to output file - specified by optional parameter.
-## Creates the output file if it doesn't exist.
-## Returns exit code if user does not have write permissions for the current working directory.
+def parse_options(arguments):
+    positional = []
+    options = {}
+    for argument in arguments:
+        if argument.startswith("--"):
+            name, _, value = argument[2:].partition("=")
+            options[name] = value if value else True
+        else:
+            positional.append(argument)
+
+    return positional, options
 
-def write_output(output_file, lines, single_line=True):
-    try:
-        with open(output_file, "a") as f:
-            if single_line:
-                f.write(lines + '\n')
-            else:
-                for line in lines:
-                    f.write(line + '\n')
-    
-    except PermissionError:
-        print("You do not have privileges to write to this file / create new output file, exiting...")
-        return 3
-    
 
-    
 '''
-Purpose: 
+Purpose: Entry point - parses programme arguments, sets the configuration and plays the game (or grades a batch of games).
 
+Usage:
 
+Mastermind.py [--strategy=genetic|minimax|entropy|islands] [--workers=N] [--islands=N] [--feedback-table=MB] [--ga-config=FILE]
+              [--fitness=secret|consistency] [--adaptive] [--turn-seconds=S] [--turn-evaluations=N] [--duplicates]
+              [--trace=FILE] <input file> <output file, or - for stdout> [code length] [max guesses] [colours...]
+Mastermind.py --batch [--workers=N] [--incremental] [--trace=FILE] <directory or glob> <output directory> [code length] [max guesses] [colours...]
+Mastermind.py --stream[=processes|threads] [--workers=N] <JSON Lines file, or - for stdin> <output file, or - for stdout>
+              [code length] [max guesses] [colours...]
+Mastermind.py --serve=<host:port or unix:path>
 
 How it works:
 
+1) Separates options from the positional arguments - an unknown option returns exit code 1. --duplicates (in any mode) allows
+repeated colours in codes and guesses, scored by standard Mastermind rules. With --serve, runs the game server
+instead (see serve()). With --trace, instruments the run and writes the trace file once it finishes (see Trace). --adaptive
+searches each guess of the genetic algorithm within --turn-seconds and/or --turn-evaluations (see Solver.search_turn()).
+2) Sets the input, output, code length, maximum guesses and available colours from the positional arguments.
+3) Either plays the single game in the input file, grades every game file matched by the input in batch mode, or grades every
+game in the input stream in stream mode (see grade_stream()).
 
 
 '''
 
 def main():
     ## Obtain arguments to call to script.
-    cmd_arguments = sys.argv
+    cmd_arguments, options = parse_options(sys.argv)
+
+    ## With the output written to stdout, status messages go to stderr.
+    global STATUS
+    STATUS = sys.stderr if len(cmd_arguments) > 2 and cmd_arguments[2] == "-" else None
+
+    if any(option not in KNOWN_OPTIONS for option in options):
+        return 1
+
+    if "duplicates" in options:
+        global DUPLICATES
+        DUPLICATES = True
+
+    if "serve" in options:
+        return serve(options["serve"])
+
+    if "trace" in options:
+        global TRACE
+        if options["trace"] is True:
+            return 1
+        TRACE = Trace(options["trace"])
+
+    if "strategy" in options:
+        global STRATEGY
+        STRATEGY = options["strategy"]
+        if STRATEGY not in STRATEGIES:
+            return 1
+
+    if "fitness" in options:
+        global FITNESS_MODE
+        FITNESS_MODE = options["fitness"]
+        if FITNESS_MODE not in FITNESS_MODES:
+            return 1
+
+    if "adaptive" in options:
+        global ADAPTIVE, TURN_SECONDS, TURN_EVALUATIONS
+        ADAPTIVE = True
+        try:
+            TURN_SECONDS = float(options.get("turn-seconds", TURN_SECONDS))
+            TURN_EVALUATIONS = int(options.get("turn-evaluations", TURN_EVALUATIONS))
+        except ValueError:
+            return 1
+        if TURN_SECONDS < 0 or TURN_EVALUATIONS < 0:
+            return 1
+
+    elif "turn-seconds" in options or "turn-evaluations" in options:
+        return 1
+
+    if "feedback-table" in options:
+        global FEEDBACK_TABLE_BUDGET
+        try:
+            FEEDBACK_TABLE_BUDGET = int(float(options["feedback-table"]) * 1024 * 1024)
+        except ValueError:
+            return 1
+
+    if "ga-config" in options:
+        result = load_hyperparameters(options["ga-config"])
+        if result is not None:
+            return result
+
+    if "islands" in options:
+        global ISLANDS
+        try:
+            ISLANDS = int(options["islands"])
+        except ValueError:
+            return 1
+        if ISLANDS < 1:
+            return 1
     
     adding_colours = False
  
@@ -564,7 +3442,7 @@ def main():
                             MAX_GUESSES = int(argument)
                             if MAX_GUESSES < 1:
                                 return 1
-                            print("Set maximum guesses to ", MAX_GUESSES)
+                            print("Set maximum guesses to ", MAX_GUESSES, file=STATUS)
                         except ValueError:
                             return 1
 
@@ -574,13 +3452,14 @@ def main():
                             CODE_LENGTH = int(argument)
                             if CODE_LENGTH < 1:
                                 return 1
-                            print("Set code length to: ", CODE_LENGTH)
+                            print("Set code length to: ", CODE_LENGTH, file=STATUS)
                         except ValueError:
                             return 1
                 
                     case 2:
-                        if not os.path.exists(argument):
-                            print("Output file path is invalid, exiting...")
+                        ## "-" writes the output to stdout rather than a file.
+                        if argument != "-" and not os.path.exists(argument):
+                            print("Output file path is invalid, exiting...", file=STATUS)
                             return 3
                         else:
                             global OUT
@@ -605,7 +3484,25 @@ def main():
 
 
         
-        result = read_input(IN)
+        try:
+            workers = int(options.get("workers", 0)) or None
+        except ValueError:
+            return 1
+
+        if options.get("batch"):
+            return grade_batch(IN, OUT, workers=workers, incremental="incremental" in options)
+
+        if options.get("stream"):
+            if options["stream"] not in (True, "processes", "threads"):
+                return 1
+            return grade_stream(IN, OUT, workers=workers or 1, threads=options["stream"] == "threads")
+
+        ## Outside of batch mode, workers split the minimax and entropy solvers' scoring of candidate guesses.
+        if workers is not None:
+            global SOLVER_WORKERS
+            SOLVER_WORKERS = workers
+
+        result = grade_file(IN, OUT, mode="a")
         return result
 
        
@@ -614,28 +3511,23 @@ def main():
 
 if __name__ == "__main__":
     result = main()
+    if TRACE is not None:
+        result = TRACE.write() or result
     match result:
         case 0:
-            print("Programme completed successfully.")
+            print("Programme completed successfully.", file=STATUS)
         case 1:
-            print("Not enough programme arguments provided.")
-        case 2:
-            line = "Issue with input file."
-            write_output(OUT, line)
+            print("Not enough programme arguments provided.", file=STATUS)
+        case 2 | 4 | 5:
+            ## The error line has already been written to the output file by grade_file().
+            pass
         case 3:
-            print("Issue with output file.")
-        case 4:
-            line = "No or ill-formed code provided."
-            write_output(OUT, line)
-            
-        case 5:
-            line = "No or ill-formed player provided."
-            write_output(OUT, line)
+            print("Issue with output file.", file=STATUS)
 
         case _:
-            print("Unknown exit code encountered.")
+            print("Unknown exit code encountered.", file=STATUS)
 
-    print("Returned exit code: ", result)
+    print("Returned exit code: ", result, file=STATUS)
 
             
 
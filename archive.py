@@ -0,0 +1,59 @@
+'''
+
+Command line for binary game archives - converts text game files to an archive, and grades an archive.
+
+'''
+
+import sys
+
+import Mastermind
+
+
+'''
+
+Purpose: Converts text game files to a binary game archive, and grades archives (see convert_to_archive() and grade_archive()
+in Mastermind.py).
+
+Usage:
+
+archive.py convert <directory or glob> <archive file> [--length=N] [--max-guesses=N] [--colours=red,blue,...] [--duplicates]
+archive.py grade <archive file> [results file]
+
+How it works:
+
+1) convert - settings not given default to those of Mastermind.py, and are stored in the archive's header. Game files which
+would not be graded in human mode are skipped.
+2) grade - grades every game with the settings in the archive's header, and writes the results column to the results file
+(the archive's path followed by ".results" by default).
+
+
+'''
+
+def main():
+    arguments, options = Mastermind.parse_options(sys.argv[1:])
+    if any(option not in {"length", "max-guesses", "colours", "duplicates"} for option in options):
+        return 1
+
+    match arguments:
+        case ["convert", pattern, archive_path]:
+            try:
+                code_length = int(options.get("length", Mastermind.CODE_LENGTH))
+                max_guesses = int(options.get("max-guesses", Mastermind.MAX_GUESSES))
+                colours     = options["colours"].split(",") if "colours" in options else Mastermind.AVAILABLE_COLOURS
+            except (ValueError, AttributeError):
+                return 1
+            config = Mastermind.GameConfig(code_length=code_length, max_guesses=max_guesses, available_colours=colours,
+                                           duplicates="duplicates" in options or Mastermind.DUPLICATES)
+            if code_length < 1 or max_guesses < 1 or config.space.size == 0:
+                return 1
+
+            return Mastermind.convert_to_archive(pattern, archive_path, config)
+
+        case ["grade", archive_path, *results_path] if len(results_path) <= 1 and not options:
+            return Mastermind.grade_archive(archive_path, results_path[0] if results_path else archive_path + ".results")
+
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+'''
+
+Seeded benchmark of Mastermind.py - human-mode grading throughput, and each computer player strategy's solve time and
+guesses, over a grid of code lengths, colour counts and maximum guesses.
+
+'''
+
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import dataclasses
+
+import Mastermind
+
+
+## Default grid of configurations to benchmark, and the amount of work done per configuration.
+
+CODE_LENGTHS    = [4]
+COLOUR_COUNTS   = [5, 6]
+MAX_GUESSES     = [12]
+STRATEGIES      = ["genetic", "minimax", "entropy"]
+GAMES           = 500   ## Human-mode game files graded per configuration.
+SOLVES          = 20    ## Computer player solves per configuration and strategy.
+SEED            = 0
+OUTPUT          = "benchmark_results.json"
+
+
+## Colours for synthetic games - "c0", "c1", ... so any colour count can be generated.
+
+def make_colours(n):
+    return [f"c{i}" for i in range(n)]
+
+
+'''
+
+Purpose: Writes synthetic human-mode game files to a directory.
+
+How it works:
+
+1) Each game gets a random secret code without duplicate colours.
+2) Up to max_guesses random guesses follow the header - mostly valid codes, with occasional ill-formed lines.
+3) Half of the games are won - the secret is placed at a random guess, followed by some junk lines which should be ignored.
+
+
+'''
+
+def write_game_files(directory, config, games, rng):
+    paths = []
+    for n in range(games):
+        code = rng.sample(config.available_colours, k=config.code_length)
+        guesses = []
+        for _ in range(rng.randint(1, config.max_guesses)):
+            if rng.random() < 0.05:
+                guesses.append("ill formed")
+            else:
+                guesses.append(' '.join(rng.sample(config.available_colours, k=config.code_length)))
+
+        if rng.random() < 0.5:
+            guesses[rng.randrange(len(guesses))] = ' '.join(code)
+            guesses.extend(["junk"] * rng.randint(0, 3))
+
+        path = os.path.join(directory, f"game{n}.txt")
+        with open(path, "w") as f:
+            f.write("code " + ' '.join(code) + "\n")
+            f.write("player human\n\n")
+            f.write('\n'.join(guesses) + "\n")
+        paths.append(path)
+
+    return paths
+
+
+'''
+
+Purpose: Measures human-mode grading throughput for one configuration - every game goes through read_input() and
+validate_guesses() via grade_file(), writing to an in-memory output so that only grading is timed.
+
+
+'''
+
+def benchmark_grading(config, games, rng):
+    Mastermind.apply_config(config)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_game_files(directory, config, games, rng)
+        guesses = 0
+        start = time.perf_counter()
+        for path in paths:
+            writer = Mastermind.OutputWriter()
+            Mastermind.grade_file(path, writer)
+            guesses += sum(1 for line in writer.getvalue().splitlines() if line.startswith("Guess"))
+        seconds = time.perf_counter() - start
+
+    return {
+        "mode":                 "human",
+        "games":                games,
+        "guesses":              guesses,
+        "seconds":              seconds,
+        "games_per_second":     games / seconds,
+        "guesses_per_second":   guesses / seconds,
+    }
+
+
+'''
+
+Purpose: Measures the computer player's cost for one configuration and strategy - wall time, guesses to solve and the number
+of evaluations, over seeded solves against random secret codes.
+
+
+'''
+
+def benchmark_solver(config, solves, rng):
+    times = []
+    guesses = []
+    evaluations = []
+    solved = 0
+    for _ in range(solves):
+        code = rng.sample(config.available_colours, k=config.code_length)
+        start = time.perf_counter()
+        result = Mastermind.make_solver(code, config, seed=rng.randrange(2 ** 32)).generate_guesses()
+        times.append(time.perf_counter() - start)
+        guesses.append(len(result.guesses))
+        evaluations.append(result.evaluations)
+        solved += result.solved
+
+    return {
+        "mode":                 "computer",
+        "strategy":             config.strategy,
+        "solves":               solves,
+        "solved":               solved,
+        "mean_seconds":         sum(times) / solves,
+        "max_seconds":          max(times),
+        "mean_guesses":         sum(guesses) / solves,
+        "max_guesses_used":     max(guesses),
+        "mean_evaluations":     sum(evaluations) / solves,
+    }
+
+
+## Parses a comma separated option value into a list.
+
+def option_list(options, name, default, convert=int):
+    if name not in options:
+        return default
+    return [convert(value) for value in options[name].split(",")]
+
+
+'''
+
+Purpose: Runs the benchmark grid and writes the results to a JSON file.
+
+Usage:
+
+benchmark.py [--lengths=4,5] [--colours=5,6] [--max-guesses=12] [--strategies=genetic,minimax,entropy] [--games=N]
+             [--solves=N] [--seed=N] [--output=FILE]
+
+How it works:
+
+1) For every combination of code length, colour count and maximum guesses - skipping those with fewer colours than the code
+length - benchmark human-mode grading, then each strategy of the computer player.
+2) Every configuration is seeded from the run's seed, so runs with the same arguments are comparable.
+3) The results are written with the genetic algorithm hyperparameters and whether NumPy was available, so regressions can be
+traced to hyperparameter or scoring changes.
+
+
+'''
+
+def main():
+    arguments, options = Mastermind.parse_options(sys.argv[1:])
+    if arguments:
+        return 1
+
+    try:
+        lengths     = option_list(options, "lengths", CODE_LENGTHS)
+        colours     = option_list(options, "colours", COLOUR_COUNTS)
+        max_guesses = option_list(options, "max-guesses", MAX_GUESSES)
+        strategies  = option_list(options, "strategies", STRATEGIES, convert=str)
+        games       = int(options.get("games", GAMES))
+        solves      = int(options.get("solves", SOLVES))
+        seed        = int(options.get("seed", SEED))
+    except ValueError:
+        return 1
+
+    if any(strategy not in Mastermind.STRATEGIES for strategy in strategies):
+        return 1
+
+    results = []
+    for code_length in lengths:
+        for colour_count in colours:
+            if colour_count < code_length:
+                continue
+            for guesses in max_guesses:
+                config = Mastermind.GameConfig(code_length=code_length, available_colours=make_colours(colour_count), max_guesses=guesses)
+                settings = {"code_length": code_length, "colours": colour_count, "max_guesses": guesses}
+                rng = random.Random(f"{seed}-{code_length}-{colour_count}-{guesses}")
+
+                result = benchmark_grading(config, games, rng)
+                results.append({**settings, **result})
+                print(f"{settings}: {result['games_per_second']:.0f} games/sec, {result['guesses_per_second']:.0f} guesses/sec")
+
+                for strategy in strategies:
+                    result = benchmark_solver(dataclasses.replace(config, strategy=strategy), solves, rng)
+                    results.append({**settings, **result})
+                    print(f"{settings} {strategy}: {result['mean_seconds']:.4f} sec/solve, {result['mean_guesses']:.2f} guesses, "
+                          f"{result['solved']}/{solves} solved")
+
+    report = {
+        "seed":             seed,
+        "numpy":            Mastermind.has_vectorised_scoring(),
+        "hyperparameters":  {
+            "TOURNAMENT_SIZE":  Mastermind.TOURNAMENT_SIZE,
+            "POPULATION_SIZE":  Mastermind.POPULATION_SIZE,
+            "MUTATION_RATE":    Mastermind.MUTATION_RATE,
+            "WHITE_PEG_REWARD": Mastermind.WHITE_PEG_REWARD,
+            "BLACK_PEG_REWARD": Mastermind.BLACK_PEG_REWARD,
+        },
+        "results":          results,
+    }
+    with open(options.get("output", OUTPUT), "w") as f:
+        json.dump(report, f, indent=4)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
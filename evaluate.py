@@ -0,0 +1,223 @@
+'''
+
+Exhaustive evaluation of a computer player strategy - solves every secret code of a configuration across a process
+pool, checkpointing finished shards so an interrupted run can be resumed.
+
+'''
+
+import os
+import sys
+import json
+import time
+import dataclasses
+import concurrent.futures
+
+import Mastermind
+
+
+## Default amount of work per shard, and where progress and results are written.
+
+SHARD_SIZE      = 500   ## Secret codes solved per shard - the unit of work for the process pool, and of checkpointing.
+SEED            = 0
+CHECKPOINT      = "evaluation_checkpoint"
+OUTPUT          = "evaluation_results.json"
+
+
+'''
+
+Purpose: Solves every secret code in one shard of the code space - one task for the process pool.
+
+How it works:
+
+1) A shard is a contiguous range of ranks in the code space - only the shard's own codes are unranked (see CodeSpace.codes()).
+2) Each secret is solved with a seed derived from the run's seed and the secret's position, so a shard gives the same results
+however the run is split or resumed.
+3) Returns the number of secrets solved in each number of guesses, the failures (not solved within the maximum guesses), and
+the total and slowest wall time per solve - and in adaptive mode, the total and slowest wall time and evaluations per turn.
+
+
+'''
+
+def evaluate_shard(job):
+    config, shard, start, end, seed = job
+    distribution = {}
+    failures = 0
+    seconds = 0
+    max_seconds = 0
+    turns = []
+    for position, code in enumerate(config.space.codes(start, end), start):
+        started = time.perf_counter()
+        result = Mastermind.make_solver(code, config, seed=seed + position).generate_guesses()
+        elapsed = time.perf_counter() - started
+        seconds += elapsed
+        max_seconds = max(max_seconds, elapsed)
+        turns.extend(result.turns)
+        if result.solved:
+            guesses = len(result.guesses)
+            distribution[guesses] = distribution.get(guesses, 0) + 1
+        else:
+            failures += 1
+
+    return {"shard": shard, "start": start, "end": end, "distribution": distribution, "failures": failures,
+            "seconds": seconds, "max_seconds": max_seconds, "turns": len(turns),
+            "turn_seconds": sum(turn.seconds for turn in turns), "max_turn_seconds": max((turn.seconds for turn in turns), default=0),
+            "turn_evaluations": sum(turn.evaluations for turn in turns)}
+
+
+## Writes a JSON file atomically, so an interrupted run never leaves a partially written shard behind.
+
+def write_json(path, data):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f, indent=4)
+    os.replace(temp_path, path)
+
+
+'''
+
+Purpose: Evaluates a strategy against every secret code of a configuration, across a process pool, with resumable progress.
+
+Usage:
+
+evaluate.py [--strategy=genetic|minimax|entropy|islands] [--fitness=secret|consistency] [--length=N] [--colours=red,blue,...]
+            [--duplicates] [--adaptive] [--turn-seconds=S] [--turn-evaluations=N] [--max-guesses=N] [--shard-size=N] [--seed=N] [--workers=N] [--feedback-table=MB] [--checkpoint=DIR] [--output=FILE]
+
+How it works:
+
+1) Settings not given default to those of Mastermind.py. The code space - every code of the code length without duplicate
+colours, or every code at all with --duplicates - is split into shards of --shard-size codes.
+2) The checkpoint directory records the run's settings, and each shard's result as soon as it finishes. Rerunning with the
+same settings skips the shards already done, so an interrupted run resumes where it stopped. Rerunning with different settings
+against the same checkpoint directory is refused (exit code 1) rather than mixing results.
+3) Once every shard is done, prints and writes the guess-count distribution, the mean and worst guesses to solve, the failures
+past the maximum guesses, and the mean and worst time per solve. With --adaptive, also the mean and worst time and the mean
+evaluations per turn - how much of the per-turn budget was used.
+
+
+'''
+
+def main():
+    arguments, options = Mastermind.parse_options(sys.argv[1:])
+    known = {"strategy", "fitness", "length", "colours", "max-guesses", "shard-size", "seed", "workers", "feedback-table",
+             "checkpoint", "output", "duplicates", "adaptive", "turn-seconds", "turn-evaluations"}
+    if arguments or any(option not in known for option in options):
+        return 1
+
+    try:
+        strategy        = options.get("strategy", Mastermind.STRATEGY)
+        fitness_mode    = options.get("fitness", Mastermind.FITNESS_MODE)
+        code_length     = int(options.get("length", Mastermind.CODE_LENGTH))
+        colours         = options["colours"].split(",") if "colours" in options else Mastermind.AVAILABLE_COLOURS
+        max_guesses     = int(options.get("max-guesses", Mastermind.MAX_GUESSES))
+        shard_size      = int(options.get("shard-size", SHARD_SIZE))
+        seed            = int(options.get("seed", SEED))
+        workers         = int(options.get("workers", 0)) or None
+        table_budget    = int(float(options.get("feedback-table", 0)) * 1024 * 1024)
+        checkpoint      = str(options.get("checkpoint", CHECKPOINT))
+        output          = str(options.get("output", OUTPUT))
+        duplicates      = "duplicates" in options or Mastermind.DUPLICATES
+        adaptive        = "adaptive" in options or Mastermind.ADAPTIVE
+        turn_seconds    = float(options.get("turn-seconds", Mastermind.TURN_SECONDS))
+        turn_evaluations = int(options.get("turn-evaluations", Mastermind.TURN_EVALUATIONS))
+    except (ValueError, AttributeError):
+        return 1
+
+    if (strategy not in Mastermind.STRATEGIES or fitness_mode not in Mastermind.FITNESS_MODES or code_length < 1 or
+            max_guesses < 1 or shard_size < 1 or len(set(colours)) != len(colours) or turn_seconds < 0 or turn_evaluations < 0):
+        return 1
+
+    config = Mastermind.GameConfig(code_length=code_length, available_colours=colours, max_guesses=max_guesses,
+                                   strategy=strategy, fitness_mode=fitness_mode, feedback_table_budget=table_budget,
+                                   duplicates=duplicates, adaptive=adaptive, turn_seconds=turn_seconds,
+                                   turn_evaluations=turn_evaluations)
+    if config.space.size == 0:
+        return 1
+    total = config.space.size
+    settings = {**dataclasses.asdict(config), "shard_size": shard_size, "seed": seed}
+    settings["available_colours"] = list(config.available_colours)
+    ## The feedback table and solver processes change how fast secrets are solved, not the results - so a run can resume with either.
+    del settings["feedback_table_budget"], settings["solver_workers"]
+
+    ## Resume from the checkpoint directory if it holds a run with the same settings.
+    os.makedirs(checkpoint, exist_ok=True)
+    settings_path = os.path.join(checkpoint, "settings.json")
+    if os.path.exists(settings_path):
+        with open(settings_path) as f:
+            if json.load(f) != settings:
+                print("Checkpoint directory holds a run with different settings, exiting...")
+                return 1
+    else:
+        write_json(settings_path, settings)
+
+    shards = {}
+    jobs = []
+    for shard, (start, end) in enumerate(config.space.ranges(shard_size)):
+        path = os.path.join(checkpoint, f"shard_{shard}.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                shards[shard] = json.load(f)
+        else:
+            jobs.append((config, shard, start, end, seed))
+
+    shard_count = len(shards) + len(jobs)
+    print(f"{total} secret codes in {shard_count} shards - {len(shards)} already done.")
+
+    ## Build (or load) the feedback table once up front, so the workers only memory-map the cached file.
+    Mastermind.FeedbackTable.for_config(config)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in concurrent.futures.as_completed([pool.submit(evaluate_shard, job) for job in jobs]):
+            result = result.result()
+            write_json(os.path.join(checkpoint, f"shard_{result['shard']}.json"), result)
+            shards[result["shard"]] = result
+            print(f"Shard {result['shard']} done - {len(shards)} of {shard_count} shards.")
+
+    distribution = {}
+    failures = 0
+    seconds = 0
+    max_seconds = 0
+    turns = 0
+    turn_seconds = 0
+    max_turn_seconds = 0
+    turn_evaluations = 0
+    for result in shards.values():
+        for guesses, count in result["distribution"].items():
+            distribution[int(guesses)] = distribution.get(int(guesses), 0) + count
+        failures += result["failures"]
+        seconds += result["seconds"]
+        max_seconds = max(max_seconds, result["max_seconds"])
+        turns += result["turns"]
+        turn_seconds += result["turn_seconds"]
+        max_turn_seconds = max(max_turn_seconds, result["max_turn_seconds"])
+        turn_evaluations += result["turn_evaluations"]
+
+    solved = sum(distribution.values())
+    summary = {
+        **settings,
+        "secrets":              total,
+        "solved":               solved,
+        "failures":             failures,
+        "distribution":         {guesses: distribution[guesses] for guesses in sorted(distribution)},
+        "mean_guesses":         sum(guesses * count for guesses, count in distribution.items()) / solved if solved else None,
+        "max_guesses_used":     max(distribution) if distribution else None,
+        "mean_seconds":         seconds / total,
+        "max_seconds":          max_seconds,
+        "mean_turn_seconds":    turn_seconds / turns if turns else None,
+        "max_turn_seconds":     max_turn_seconds if turns else None,
+        "mean_turn_evaluations": turn_evaluations / turns if turns else None,
+    }
+    write_json(output, summary)
+
+    print(f"Solved {solved} of {total} secret codes, {failures} failures past {max_guesses} guesses.")
+    for guesses, count in summary["distribution"].items():
+        print(f"{guesses} guesses: {count}")
+    if solved:
+        print(f"Mean guesses: {summary['mean_guesses']:.3f}, worst: {summary['max_guesses_used']}")
+    print(f"Mean time per solve: {summary['mean_seconds'] * 1000:.2f} ms, worst: {max_seconds * 1000:.2f} ms")
+    if turns:
+        print(f"Mean time per turn: {summary['mean_turn_seconds'] * 1000:.2f} ms, worst: {max_turn_seconds * 1000:.2f} ms, "
+              f"mean evaluations per turn: {summary['mean_turn_evaluations']:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
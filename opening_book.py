@@ -0,0 +1,63 @@
+'''
+
+Builds the computer player's opening book for a configuration offline.
+
+'''
+
+import sys
+import time
+
+import Mastermind
+
+
+'''
+
+Purpose: Builds the opening book for a configuration offline, so the computer player can read its first guesses from disk (see
+build_opening_book() in Mastermind.py).
+
+Usage:
+
+opening_book.py [--strategy=genetic|minimax|entropy|islands] [--length=N] [--colours=red,blue,...] [--duplicates]
+                [--feedback-table=MB]
+
+How it works:
+
+1) Settings not given default to those of Mastermind.py - the book is only used by games with the same strategy, code length,
+colours (in the same order) and duplicate-colour mode.
+2) Builds the book, replacing any existing book for the configuration, and prints the opening and the number of replies.
+
+
+'''
+
+def main():
+    arguments, options = Mastermind.parse_options(sys.argv[1:])
+    if arguments or any(option not in {"strategy", "length", "colours", "duplicates", "feedback-table"} for option in options):
+        return 1
+
+    try:
+        strategy        = options.get("strategy", Mastermind.STRATEGY)
+        code_length     = int(options.get("length", Mastermind.CODE_LENGTH))
+        colours         = options["colours"].split(",") if "colours" in options else Mastermind.AVAILABLE_COLOURS
+        table_budget    = int(float(options.get("feedback-table", 0)) * 1024 * 1024)
+        duplicates      = "duplicates" in options or Mastermind.DUPLICATES
+    except (ValueError, AttributeError):
+        return 1
+
+    if strategy not in Mastermind.STRATEGIES or code_length < 1 or len(set(colours)) != len(colours):
+        return 1
+
+    config = Mastermind.GameConfig(code_length=code_length, available_colours=colours, strategy=strategy,
+                                   feedback_table_budget=table_budget, duplicates=duplicates)
+    if config.space.size == 0:
+        return 1
+
+    started = time.perf_counter()
+    book = Mastermind.build_opening_book(config)
+    print(f"Opening: {' '.join(book['opening'])}")
+    print(f"Replies: {len(book['replies'])}")
+    print(f"Written to {Mastermind.opening_book_path(config)} in {time.perf_counter() - started:.2f} seconds.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+'''
+
+Hyperparameter sweep for the genetic algorithm - runs the same seeded solves for every combination of the given values
+across a process pool, ranks the combinations, and can write the best as a --ga-config file.
+
+'''
+
+import sys
+import json
+import time
+import random
+import itertools
+import dataclasses
+import concurrent.futures
+
+import Mastermind
+from benchmark import make_colours, option_list
+
+
+## Default configuration to tune for, and the amount of work done per combination of hyperparameters.
+
+CODE_LENGTH     = 4
+COLOURS         = 6
+MAX_GUESSES     = 12
+SOLVES          = 100   ## Seeded solves per combination of hyperparameters.
+SEED            = 0
+TAIL            = 0.95  ## Quantile of guesses-to-solve used as the tail measure.
+OUTPUT          = "sweep_results.json"
+
+
+'''
+
+Purpose: Runs the seeded solves for a single combination of hyperparameters - one task for the process pool.
+
+How it works:
+
+1) Every combination solves the same secret codes with the same solver seeds, so combinations are compared like for like.
+2) Guesses-to-solve is the number of guesses made - a failed solve counts as the maximum guesses, and is also counted as a
+failure.
+3) CPU time is measured with process_time(), so it is not skewed by other workers competing for cores.
+
+
+'''
+
+def run_combination(job):
+    config, secrets = job
+    guesses = []
+    failures = 0
+    start = time.process_time()
+    for secret, seed in secrets:
+        result = Mastermind.Solver(secret, config, seed=seed).generate_guesses()
+        guesses.append(len(result.guesses))
+        failures += not result.solved
+    cpu_seconds = time.process_time() - start
+
+    guesses.sort()
+    return {
+        **{name: getattr(config, name) for name in Mastermind.HYPERPARAMETERS},
+        "mean_guesses":     sum(guesses) / len(guesses),
+        "tail_guesses":     guesses[min(len(guesses) - 1, int(TAIL * len(guesses)))],
+        "failures":         failures,
+        "cpu_seconds":      cpu_seconds,
+    }
+
+
+'''
+
+Purpose: Sweeps the genetic algorithm's hyperparameters over a process pool, and ranks every combination.
+
+Usage:
+
+sweep.py [--tournament-size=2,3] [--population-size=10,50] [--mutation-rate=0.01,0.1] [--white-peg-reward=5]
+         [--black-peg-reward=10] [--length=4] [--colours=6] [--max-guesses=12] [--solves=N] [--seed=N] [--workers=N]
+         [--output=FILE] [--write-config=FILE]
+
+How it works:
+
+1) Each hyperparameter takes a comma separated list of values - any not given keep their current value in Mastermind.py.
+2) Every combination of values is solved in the process pool (see run_combination()).
+3) Combinations are ranked by mean guesses-to-solve, then tail guesses-to-solve, then CPU time - and written to the output file.
+4) With --write-config, the best combination is written as a configuration file which Mastermind.py loads with --ga-config.
+
+
+'''
+
+def main():
+    arguments, options = Mastermind.parse_options(sys.argv[1:])
+    if arguments:
+        return 1
+
+    try:
+        ranges = {}
+        for name, convert in Mastermind.HYPERPARAMETERS.items():
+            default = [getattr(Mastermind, name.upper())]
+            ranges[name] = option_list(options, name.replace("_", "-"), default, convert=convert)
+        code_length = int(options.get("length", CODE_LENGTH))
+        colours     = int(options.get("colours", COLOURS))
+        max_guesses = int(options.get("max-guesses", MAX_GUESSES))
+        solves      = int(options.get("solves", SOLVES))
+        seed        = int(options.get("seed", SEED))
+        workers     = int(options.get("workers", 0)) or None
+    except ValueError:
+        return 1
+
+    if colours < code_length:
+        return 1
+
+    base = Mastermind.GameConfig(code_length=code_length, available_colours=make_colours(colours), max_guesses=max_guesses)
+    rng = random.Random(seed)
+    secrets = [(rng.sample(base.available_colours, k=code_length), rng.randrange(2 ** 32)) for _ in range(solves)]
+
+    jobs = []
+    for values in itertools.product(*ranges.values()):
+        hyperparameters = dict(zip(ranges, values))
+        if hyperparameters["tournament_size"] < 1 or hyperparameters["population_size"] < hyperparameters["tournament_size"]:
+            continue
+        jobs.append((dataclasses.replace(base, **hyperparameters), secrets))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run_combination, jobs))
+
+    results.sort(key=lambda result: (result["mean_guesses"], result["tail_guesses"], result["cpu_seconds"]))
+    for rank, result in enumerate(results[:10]):
+        print(f"{rank + 1}. {', '.join(f'{name}={result[name]}' for name in Mastermind.HYPERPARAMETERS)}: "
+              f"{result['mean_guesses']:.2f} mean guesses, {result['tail_guesses']} tail guesses, "
+              f"{result['failures']} failures, {result['cpu_seconds']:.2f} CPU seconds")
+
+    with open(options.get("output", OUTPUT), "w") as f:
+        json.dump({"code_length": code_length, "colours": colours, "max_guesses": max_guesses, "solves": solves,
+                   "seed": seed, "results": results}, f, indent=4)
+
+    if "write-config" in options and results:
+        with open(options["write-config"], "w") as f:
+            json.dump({name: results[0][name] for name in Mastermind.HYPERPARAMETERS}, f, indent=4)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())